@@ -69,10 +69,11 @@ def example_custom_processing():
     print(f"\nKeywords with arguments: {len(with_args)}")
     
     # Find the most nested keyword
-    max_level = max(keyword['level'] for keyword in keywords)
-    nested_keywords = [k for k in keywords if k['level'] == max_level]
+    max_level = extractor.max_level()
+    nested_indices = extractor.filter_by_level(max_level)
     print(f"\nMost nested keywords (level {max_level}):")
-    for keyword in nested_keywords[:5]:  # Show first 5
+    for index in nested_indices[:5]:  # Show first 5
+        keyword = keywords[index]
         indent = "  " * keyword['level']
         print(f"  {indent}{keyword['name']}")
 
@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration for the web interface
+
+Run with: gunicorn -c gunicorn.conf.py web_recommender:app
+
+The master process loads the model once and places its large arrays in shared
+memory; every worker attaches to them instead of loading its own copy.
+"""
+
+import os
+import tempfile
+from robot_keyword_recommender import RobotKeywordRecommender
+import web_recommender
+
+bind = "0.0.0.0:5000"
+workers = 4
+
+# Shared memory blocks holding the model, owned by the master process
+shared_blocks = []
+shared_meta = os.path.join(tempfile.gettempdir(), f"robot_keyword_model.{os.getpid()}.shared")
+
+def on_starting(server):
+    """Export the model to shared memory before the workers are started.
+    
+    Without a saved model, it is trained and saved here once, so the workers
+    never train or write the model file themselves.
+    """
+    if os.path.exists(web_recommender.MODEL_FILE):
+        recommender = RobotKeywordRecommender(web_recommender.MODEL_FILE)
+    else:
+        output_files = web_recommender.find_output_files()
+        if not output_files:
+            raise RuntimeError(f"No {web_recommender.MODEL_FILE} or output.xml files found. "
+                               "Please train the model first.")
+        print("No existing model found. Training on available data...")
+        recommender = RobotKeywordRecommender()
+        recommender.train_on_output_files(output_files, web_recommender.MODEL_FILE)
+    
+    analyzer = recommender.analyzer
+    shared_blocks.extend(analyzer.export_shared(shared_meta))
+    os.environ[web_recommender.SHARED_MODEL_ENV] = shared_meta
+
+def post_worker_init(worker):
+    """Load the recommender in each worker."""
+    web_recommender.initialize_recommender()
+
+def on_exit(server):
+    """Remove the shared model once all workers have stopped."""
+    for block in shared_blocks:
+        block.close()
+        block.unlink()
+    if os.path.exists(shared_meta):
+        os.remove(shared_meta)
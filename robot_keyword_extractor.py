@@ -7,128 +7,819 @@ used in the order of execution, including their hierarchy and timing information
 """
 
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
+import csv
+import getpass
+import hashlib
+import io
+import os
+import pickle
 import sys
 import argparse
+import tempfile
+from array import array
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Generator, Tuple, BinaryIO, Union, Optional, NamedTuple
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# numpy and numba are optional and imported by _level_kernels() on first use
+np = None
+numba = None
+
+# Available XML parser backends. expat callbacks create no element objects,
+# which measured faster than both iterparse backends on large outputs.
+PARSER_BACKENDS = ('expat',) + (('lxml',) if lxml_etree is not None else ()) + ('etree',)
+DEFAULT_BACKEND = 'expat'
+
+# Elements the keyword extraction reacts to; everything else is skipped
+TRACKED_TAGS = frozenset(('kw', 'test', 'suite', 'robot'))
+
+# Exceptions raised by the backends for malformed XML
+PARSE_ERRORS = (ET.ParseError, expat.ExpatError) + (
+    (lxml_etree.ParseError,) if lxml_etree is not None else ())
+
+# Bump when KeywordTable changes so stale keyword caches are ignored
+CACHE_VERSION = 3
+
+# Bytes fed to the expat parser at a time
+EXPAT_CHUNK_SIZE = 1 << 16
+
+# Number of keywords buffered by print_keywords per write to stdout
+PRINT_CHUNK_KEYWORDS = 1024
+
+# Robot Framework timestamp format up to the seconds, e.g. "20120605 11:09:42"
+TIMESTAMP_FORMAT = '%Y%m%d %H:%M:%S'
+
+
+# Minimum number of keywords before filter_by_level/max_level use numba. Below
+# this the plain loops finish before numba is even imported and its cached
+# kernels are loaded (about 0.3 s on the first call).
+JIT_MIN_LEVEL_VALUES = 5000000
+
+# Compiled level filters: (match_mask, max_value), () when numba is missing
+_LEVEL_KERNELS = None
+
+
+def _level_kernels() -> Optional[Tuple[Any, Any]]:
+    """
+    Return the compiled level filter kernels, or None when numba is not installed.
+    
+    Importing numba takes about a quarter of a second, so it happens on the
+    first large level filter rather than with this module; the CLI never needs it.
+    """
+    global np, numba, _LEVEL_KERNELS
+    if _LEVEL_KERNELS is None:
+        try:
+            import numpy as np
+            import numba
+        except ImportError:
+            np = None
+            _LEVEL_KERNELS = ()
+            return None
+        
+        @numba.njit(parallel=True, cache=True)
+        def match_mask(values, target):
+            """Return a boolean mask of the entries equal to target."""
+            mask = np.empty(values.shape[0], dtype=np.bool_)
+            for i in numba.prange(values.shape[0]):
+                mask[i] = values[i] == target
+            return mask
+        
+        @numba.njit(cache=True)
+        def max_value(values):
+            """Return the largest entry of a non-empty array."""
+            result = values[0]
+            for i in range(1, values.shape[0]):
+                if values[i] > result:
+                    result = values[i]
+            return result
+        
+        _LEVEL_KERNELS = (match_mask, max_value)
+    return _LEVEL_KERNELS or None
+
+
+class TimestampParser:
+    """
+    Convert Robot Framework timestamps to epoch seconds.
+    
+    Robot Framework writes local time without a UTC offset, so such
+    timestamps are read in the local timezone; ISO 8601 timestamps with an
+    offset keep it.
+    
+    Consecutive keywords mostly start within the same second, so the epoch of
+    the last seen "YYYYMMDD HH:MM:SS" prefix is cached and only the
+    fractional seconds are parsed on a cache hit. Missing or unparsable timestamps
+    become NaN.
+    """
+    __slots__ = ('_prefix', '_epoch')
+    
+    def __init__(self):
+        self._prefix = None
+        self._epoch = 0.0
+    
+    def __call__(self, timestamp: str) -> float:
+        if not timestamp:
+            return float('nan')
+        prefix, dot, fraction = timestamp.rpartition('.')
+        if not dot:
+            prefix, fraction = timestamp, ''
+        try:
+            if prefix != self._prefix:
+                self._epoch = self._parse_seconds(prefix)
+                self._prefix = prefix
+            if fraction:
+                return self._epoch + int(fraction) / 10 ** len(fraction)
+            return self._epoch
+        except ValueError:
+            return float('nan')
+    
+    @staticmethod
+    def _parse_seconds(text: str) -> float:
+        """Parse a timestamp without its fractional part into epoch seconds."""
+        try:
+            parsed = datetime.strptime(text, TIMESTAMP_FORMAT)
+        except ValueError:
+            # Newer Robot Framework versions use ISO 8601 timestamps
+            parsed = datetime.fromisoformat(text)
+        return parsed.timestamp()
+
+
+class KeywordRecord(NamedTuple):
+    """The fields of a keyword that describe where it ran, without building its dictionary."""
+    name: str
+    type: str
+    library: str
+    level: int
+
+
+@dataclass
+class KeywordTable:
+    """
+    Column-oriented storage for extracted keywords.
+    
+    Every column holds one entry per keyword in execution order. Statuses and
+    test names are interned into small lookup lists and stored as integer
+    indices. Parents are stored as ids into a tree of name nodes
+    (parent_names/parent_of); the dotted parent path is only built when a
+    keyword is materialized. Indexing or iterating the table yields the
+    familiar keyword dictionaries, so it can be used like the list it replaces.
+    
+    A streaming consumer can drop rows it no longer needs with discard_rows().
+    Row indices keep counting in execution order; the columns then only hold
+    the rows from first_row on.
+    """
+    names: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+    libraries: List[str] = field(default_factory=list)
+    levels: array = field(default_factory=lambda: array('i'))
+    statuses: array = field(default_factory=lambda: array('b'))  # Index into status_names
+    parent_idx: array = field(default_factory=lambda: array('i'))  # Parent node id
+    test_idx: array = field(default_factory=lambda: array('i'))  # Index into test_names
+    start_times: List[str] = field(default_factory=list)
+    end_times: List[str] = field(default_factory=list)
+    arguments: List[Tuple[str, ...]] = field(default_factory=list)
+    return_values: List[Tuple[str, ...]] = field(default_factory=list)
+    arguments_joined: List[str] = field(default_factory=list)  # '; '-joined, as exported to CSV
+    return_values_joined: List[str] = field(default_factory=list)  # '; '-joined, as exported to CSV
+    status_names: List[str] = field(default_factory=lambda: ['UNKNOWN'])
+    parent_names: List[str] = field(default_factory=lambda: [''])  # Name of each parent node
+    parent_of: array = field(default_factory=lambda: array('i', [0]))  # Enclosing node of each node
+    test_names: List[str] = field(default_factory=lambda: [''])
+    first_row: int = 0  # Execution index of the first row held by the columns
+    _lookup: Dict[str, Dict[str, int]] = field(default_factory=dict, repr=False)
+    _status_index: Optional[Dict[str, List[int]]] = field(default=None, repr=False)
+    _start_epochs: array = field(default_factory=lambda: array('d'), repr=False)
+    _end_epochs: array = field(default_factory=lambda: array('d'), repr=False)
+    
+    def _intern(self, column: str, names: List[str], value: str) -> int:
+        """Return the index of value in names, appending it if not seen before."""
+        lookup = self._lookup.get(column)
+        if lookup is None:
+            lookup = self._lookup[column] = {name: i for i, name in enumerate(names)}
+        index = lookup.get(value)
+        if index is None:
+            index = lookup[value] = len(names)
+            names.append(value)
+        return index
+    
+    def add_parent(self, name: str, parent_id: int = 0) -> int:
+        """Add a parent node named name below parent_id and return its id."""
+        self.parent_names.append(name)
+        self.parent_of.append(parent_id)
+        return len(self.parent_names) - 1
+    
+    def append(self, name: str, keyword_type: str, library: str, level: int, parent_id: int,
+               test_name: str, start_time: str, end_time: str) -> int:
+        """Append a keyword with UNKNOWN status and return its row index."""
+        self.names.append(name)
+        self.types.append(keyword_type)
+        self.libraries.append(library)
+        self.levels.append(level)
+        self.statuses.append(0)
+        self.parent_idx.append(parent_id)
+        self.test_idx.append(self._intern('test', self.test_names, test_name))
+        self.start_times.append(start_time)
+        self.end_times.append(end_time)
+        self.arguments.append(())
+        self.return_values.append(())
+        self.arguments_joined.append('')
+        self.return_values_joined.append('')
+        self._status_index = None
+        return self.first_row + len(self.names) - 1
+    
+    def set_result(self, index: int, status: str, arguments: Tuple[str, ...],
+                   return_values: Tuple[str, ...]) -> None:
+        """Store the status, arguments and return values of a keyword."""
+        index -= self.first_row
+        self.statuses[index] = self._intern('status', self.status_names, status)
+        self._status_index = None
+        self.arguments[index] = arguments
+        self.return_values[index] = return_values
+        if arguments:
+            self.arguments_joined[index] = '; '.join(arguments)
+        if return_values:
+            self.return_values_joined[index] = '; '.join(return_values)
+    
+    def status_index(self) -> Dict[str, List[int]]:
+        """
+        Return row indices grouped by upper-cased status.
+        
+        Keywords only get their status once their whole body has been parsed,
+        i.e. not in execution order, so the index is built in one pass on
+        first use and cached until the table changes.
+        """
+        if self._status_index is None:
+            rows_by_code = [[] for _ in self.status_names]
+            for index, code in enumerate(self.statuses, self.first_row):
+                rows_by_code[code].append(index)
+            
+            index = {}
+            for name, rows in zip(self.status_names, rows_by_code):
+                key = name.upper()
+                if key in index:
+                    rows = sorted(index[key] + rows)
+                index[key] = rows
+            self._status_index = index
+        return self._status_index
+    
+    @property
+    def start_epochs(self) -> array:
+        """Epoch seconds of start_times, NaN where missing; parsed on first use."""
+        return self._epochs(self.start_times, self._start_epochs)
+    
+    @property
+    def end_epochs(self) -> array:
+        """Epoch seconds of end_times, NaN where missing; parsed on first use."""
+        return self._epochs(self.end_times, self._end_epochs)
+    
+    @staticmethod
+    def _epochs(times: List[str], epochs: array) -> array:
+        """Parse the times appended since epochs was last brought up to date into it."""
+        if len(epochs) < len(times):
+            epochs.extend(map(TimestampParser(), times[len(epochs):]))
+        return epochs
+    
+    def status(self, index: int) -> str:
+        """Return the status of the keyword at index."""
+        return self.status_names[self.statuses[index - self.first_row]]
+    
+    def parent(self, index: int) -> str:
+        """Return the dotted parent name of the keyword at index."""
+        return self._full_parent(self.parent_idx[index - self.first_row])
+    
+    def _full_parent(self, parent_id: int) -> str:
+        """Build the dotted name of a parent node by walking up to the root."""
+        names = []
+        while parent_id:
+            names.append(self.parent_names[parent_id])
+            parent_id = self.parent_of[parent_id]
+        return '.'.join(reversed(names))
+    
+    def test_name(self, index: int) -> str:
+        """Return the test name of the keyword at index."""
+        return self.test_names[self.test_idx[index - self.first_row]]
+    
+    def row(self, index: int) -> Dict[str, Any]:
+        """Return the keyword at index as a dictionary."""
+        row = index - self.first_row
+        return {
+            'name': self.names[row],
+            'type': self.types[row],
+            'library': self.libraries[row],
+            'level': self.levels[row],
+            'parent': self._full_parent(self.parent_idx[row]),
+            'test_name': self.test_names[self.test_idx[row]],
+            'start_time': self.start_times[row],
+            'end_time': self.end_times[row],
+            'status': self.status_names[self.statuses[row]],
+            'arguments': list(self.arguments[row]),
+            'return_values': list(self.return_values[row]),
+            'execution_order': index + 1
+        }
+    
+    def record(self, index: int) -> KeywordRecord:
+        """Return the name, type, library and level of the keyword at index."""
+        row = index - self.first_row
+        return KeywordRecord(self.names[row], self.types[row], self.libraries[row],
+                             self.levels[row])
+    
+    def columns(self) -> Dict[str, Any]:
+        """
+        Return the public fields by name, e.g. for pickling.
+        
+        They only hold builtins and arrays, so KeywordTable(**columns) rebuilds
+        the table in any process, whichever module name this one was run as.
+        """
+        return {column.name: getattr(self, column.name) for column in fields(self)
+                if not column.name.startswith('_')}
+    
+    def discard_rows(self, end: int) -> None:
+        """Drop the rows before execution index end from the columns to free their memory."""
+        count = end - self.first_row
+        if count <= 0:
+            return
+        for column in (self.names, self.types, self.libraries, self.levels, self.statuses,
+                       self.parent_idx, self.test_idx, self.start_times, self.end_times,
+                       self.arguments, self.return_values, self.arguments_joined,
+                       self.return_values_joined, self._start_epochs, self._end_epochs):
+            del column[:count]
+        self.first_row = end
+        self._status_index = None
+    
+    def __len__(self) -> int:
+        return self.first_row + len(self.names)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not self.first_row <= index < len(self):
+            raise IndexError('keyword index out of range')
+        return self.row(index)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.first_row, len(self)):
+            yield self.row(index)
+
+
+def default_cache_dir() -> str:
+    """Return (and create) a private per-user directory for keyword caches."""
+    cache_dir = os.path.join(tempfile.gettempdir(), f"robot_keyword_cache_{getpass.getuser()}")
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    # Cached tables are unpickled, so never trust a directory owned by someone else
+    if hasattr(os, 'getuid') and os.stat(cache_dir).st_uid != os.getuid():
+        raise PermissionError(f"Cache directory '{cache_dir}' is not owned by the current user")
+    return cache_dir
+
+
+class _OpenKeyword:
+    """Bookkeeping for a keyword element that the expat backend is inside of."""
+    __slots__ = ('index', 'depth', 'status', 'arguments', 'return_values', 'values', 'item_tag')
+    
+    def __init__(self, index: int, depth: int):
+        self.index = index
+        self.depth = depth  # Element depth of the <kw> element itself
+        self.status = None
+        self.arguments = None
+        self.return_values = None
+        self.values = None  # List receiving <arg>/<return> texts while inside their container
+        self.item_tag = None  # Tag of the items inside the open container
 
 
 class RobotKeywordExtractor:
     """Extracts and processes keywords from Robot Framework output.xml files."""
     
-    def __init__(self, output_file: str):
-        """Initialize the extractor with the output.xml file path."""
+    def __init__(self, output_file: str, backend: str = DEFAULT_BACKEND,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialize the extractor.
+        
+        Args:
+            output_file: Path to the output.xml file
+            backend: XML parser backend, one of PARSER_BACKENDS
+            cache_dir: Directory for pickled keyword tables; None disables caching
+        """
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unsupported XML parser backend '{backend}'. "
+                             f"Available backends: {', '.join(PARSER_BACKENDS)}")
         self.output_file = output_file
-        self.keywords = []
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.keywords = KeywordTable()
+        
+    def parse_xml(self, source: BinaryIO) -> Iterator[Tuple[str, ET.Element]]:
+        """Return a streaming iterator of (event, element) pairs for the XML source."""
+        if self.backend == 'expat':
+            raise ValueError("The expat backend does not produce elements")
+        if self.backend == 'lxml':
+            # libxml2 tokenizes in C; skip ID bookkeeping and whitespace-only text nodes,
+            # and only report events for the tracked tags
+            return lxml_etree.iterparse(source, events=('start', 'end'), tag=TRACKED_TAGS,
+                                        huge_tree=True, collect_ids=False,
+                                        remove_blank_text=True)
+        return ET.iterparse(source, events=('start', 'end'))
+    
+    def _fill_keyword_result(self, index: int, element: ET.Element) -> None:
+        """Store status, arguments and return values of a finished keyword element."""
+        # Extract status
+        status_elem = element.find('status')
+        status = status_elem.get('status', 'UNKNOWN') if status_elem is not None else 'UNKNOWN'
+        
+        # Extract arguments
+        arguments = ()
+        args_elem = element.find('arguments')
+        if args_elem is not None:
+            arguments = tuple(arg.text or '' for arg in args_elem.findall('arg'))
+        
+        # Extract return values
+        return_values = ()
+        return_elem = element.find('return')
+        if return_elem is not None:
+            return_values = tuple(ret.text or '' for ret in return_elem.findall('return'))
+        
+        self.keywords.set_result(index, status, arguments, return_values)
+    
+    def stream_keywords(self) -> None:
+        """
+        Extract keywords in a single streaming pass over the XML file.
+        
+        Keywords are recorded on their ``start`` event so that execution order
+        is preserved, and completed on their ``end`` event once status,
+        arguments and return values have been parsed. Finished kw, test and
+        suite elements are cleared, so the full tree is never held in memory.
+        The expat backend goes further and never creates element objects at all.
+        """
+        with open(self.output_file, 'rb') as source:
+            steps = self._parse_steps(source)
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as finished:
+                    robot_found = finished.value
+                    break
+        
+        if not robot_found:
+            print("Error: No robot element found in the XML file.")
+            sys.exit(1)
+    
+    def iter_keywords(self, records: bool = False) -> Iterator[Union[Dict[str, Any], KeywordRecord]]:
+        """
+        Yield keyword dictionaries in execution order while the file is parsed.
+        
+        A keyword is yielded as soon as it and every keyword before it have
+        been parsed completely, so consumers do not wait for the whole file
+        and no list of dictionaries is built. Yielded rows are discarded from
+        self.keywords, which therefore never holds the whole file. The cache is
+        not used; errors are reported like in extract_keywords.
         
-    def parse_xml(self) -> ET.Element:
-        """Parse the XML file and return the root element."""
+        Args:
+            records: Yield KeywordRecord tuples instead of full dictionaries
+        """
+        self.keywords = KeywordTable()
+        keywords = self.keywords
+        row = keywords.record if records else keywords.row
         try:
-            tree = ET.parse(self.output_file)
-            return tree.getroot()
-        except ET.ParseError as e:
+            with open(self.output_file, 'rb') as source:
+                steps = self._parse_steps(source)
+                while True:
+                    try:
+                        completed = next(steps)
+                    except StopIteration as finished:
+                        robot_found = finished.value
+                        break
+                    for index in range(keywords.first_row, completed):
+                        yield row(index)
+                    keywords.discard_rows(completed)
+        except PARSE_ERRORS as e:
             print(f"Error parsing XML file: {e}")
             sys.exit(1)
         except FileNotFoundError:
             print(f"Error: File '{self.output_file}' not found.")
             sys.exit(1)
-        except Exception as e:
-            print(f"Error reading file: {e}")
+        
+        if not robot_found:
+            print("Error: No robot element found in the XML file.")
             sys.exit(1)
     
-    def extract_keywords_recursive(self, element: ET.Element, level: int = 0, 
-                                 parent_name: str = "", test_name: str = "") -> None:
+    def _parse_steps(self, source: BinaryIO) -> Generator[int, None, bool]:
         """
-        Recursively extract keywords from XML elements.
+        Parse source into self.keywords with the selected backend.
         
-        Args:
-            element: XML element to process
-            level: Current nesting level
-            parent_name: Name of parent element
-            test_name: Name of the test case
-        """
-        # Check if this is a keyword element
-        if element.tag == 'kw':
-            keyword_name = element.get('name', 'Unknown')
-            keyword_type = element.get('type', 'keyword')
-            keyword_library = element.get('library', '')
-            
-            # Extract timing information
-            start_time = element.get('starttime', '')
-            end_time = element.get('endtime', '')
-            
-            # Extract status
-            status_elem = element.find('status')
-            status = status_elem.get('status', 'UNKNOWN') if status_elem is not None else 'UNKNOWN'
+        Yields, as parsing progresses, the number of keywords at the start of
+        the table that are complete. Returns whether a robot element was found.
+        """
+        if self.backend == 'expat':
+            return (yield from self._process_expat(source))
+        return (yield from self._process_events(self.parse_xml(source)))
+    
+    def _process_expat(self, source: BinaryIO) -> Generator[int, None, bool]:
+        """
+        Build keyword records directly from expat callbacks.
+        
+        Only kw, test and suite elements and the status/arguments/return
+        children of keywords are looked at; text is only collected while
+        inside an <arg> or <return> item. Yields the number of complete
+        keywords after each chunk of input and returns whether a robot
+        element was found.
+        """
+        keywords = self.keywords
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        
+        # Enclosing (level, parent_id, test_name, open_keyword) for each open kw/test
+        frames = []
+        outermost = None  # Index of the outermost open keyword
+        open_keywords = 0
+        depth = 0
+        level = 0
+        parent_id = 0
+        test_name = ""
+        robot_found = False
+        suite_depth = 0
+        current = None  # Innermost open keyword, None directly inside a test
+        text = None  # Text chunks of the <arg>/<return> item being read
+        
+        def start_element(tag: str, attrs: Dict[str, str]) -> None:
+            nonlocal depth, level, parent_id, test_name, robot_found, suite_depth, current, text
+            nonlocal outermost, open_keywords
+            depth += 1
+            if text is not None:
+                # Like ElementTree's .text, only keep text before the first child
+                parser.CharacterDataHandler = None
             
-            # Extract arguments
-            arguments = []
-            args_elem = element.find('arguments')
-            if args_elem is not None:
-                for arg in args_elem.findall('arg'):
-                    arguments.append(arg.text or '')
+            if tag == 'kw':
+                if not suite_depth:
+                    return
+                keyword_name = attrs.get('name', 'Unknown')
+                index = keywords.append(
+                    keyword_name,
+                    attrs.get('type', 'keyword'),
+                    attrs.get('library', ''),
+                    level,
+                    parent_id,
+                    test_name,
+                    attrs.get('starttime', ''),
+                    attrs.get('endtime', '')
+                )
+                frames.append((level, parent_id, test_name, current))
+                current = _OpenKeyword(index, depth)
+                if not open_keywords:
+                    outermost = index
+                open_keywords += 1
+                
+                # Nested keywords are one level deeper below this keyword
+                level += 1
+                parent_id = keywords.add_parent(keyword_name, parent_id)
+            elif current is not None and depth - current.depth <= 2:
+                if depth - current.depth == 1:
+                    if tag == 'status':
+                        if current.status is None:
+                            current.status = attrs.get('status', 'UNKNOWN')
+                    elif tag == 'arguments':
+                        if current.arguments is None:
+                            current.values = current.arguments = []
+                            current.item_tag = 'arg'
+                    elif tag == 'return':
+                        if current.return_values is None:
+                            current.values = current.return_values = []
+                            current.item_tag = 'return'
+                elif current.values is not None and tag == current.item_tag:
+                    text = []
+                    parser.CharacterDataHandler = text.append
+            elif tag == 'test':
+                if not suite_depth:
+                    return
+                frames.append((level, parent_id, test_name, current))
+                current = None
+                test_name = attrs.get('name', 'Unknown Test')
+                parent_id = keywords.add_parent(test_name)
+            elif tag == 'suite':
+                if robot_found:
+                    suite_depth += 1
+            elif tag == 'robot':
+                robot_found = True
+        
+        def end_element(tag: str) -> None:
+            nonlocal depth, level, parent_id, test_name, suite_depth, current, text
+            nonlocal open_keywords
+            if tag == 'kw' or tag == 'test':
+                if suite_depth:
+                    if current is not None and current.depth == depth:
+                        keywords.set_result(current.index, current.status or 'UNKNOWN',
+                                            tuple(current.arguments or ()),
+                                            tuple(current.return_values or ()))
+                        open_keywords -= 1
+                    level, parent_id, test_name, current = frames.pop()
+            elif tag == 'suite':
+                if suite_depth:
+                    suite_depth -= 1
+            elif current is not None:
+                if text is not None and depth - current.depth == 2:
+                    current.values.append(''.join(text))
+                    parser.CharacterDataHandler = None
+                    text = None
+                elif depth - current.depth == 1:
+                    current.values = None
+            depth -= 1
+        
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        while True:
+            chunk = source.read(EXPAT_CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+            yield outermost if open_keywords else len(keywords)
+        yield len(keywords)
+        return robot_found
+    
+    def _process_events(self, events: Iterator[Tuple[str, ET.Element]]) -> Generator[int, None, bool]:
+        """
+        Build keyword records from a stream of (event, element) pairs.
+        
+        Events for elements other than kw, test, suite and robot are skipped
+        without any bookkeeping; lxml already filters them out in C. Yields
+        the number of complete keywords whenever the outermost open keyword
+        ends and returns whether a robot element was found.
+        """
+        detach = self.backend == 'lxml'  # Only lxml elements know their parent
+        # Enclosing (level, parent_id, test_name, keyword_index) for each open kw/test;
+        # keyword_index is None for tests
+        frames = []
+        keywords = self.keywords
+        
+        level = 0
+        parent_id = 0
+        test_name = ""
+        robot_found = False
+        suite_depth = 0
+        open_keywords = 0
+        
+        for event, element in events:
+            tag = element.tag
+            if tag not in TRACKED_TAGS:
+                continue
             
-            # Extract return values
-            return_values = []
-            return_elem = element.find('return')
-            if return_elem is not None:
-                for ret in return_elem.findall('return'):
-                    return_values.append(ret.text or '')
+            if event == 'start':
+                if tag == 'kw':
+                    if not suite_depth:
+                        continue
+                    keyword_name = element.get('name', 'Unknown')
+                    index = keywords.append(
+                        keyword_name,
+                        element.get('type', 'keyword'),
+                        element.get('library', ''),
+                        level,
+                        parent_id,
+                        test_name,
+                        element.get('starttime', ''),
+                        element.get('endtime', '')
+                    )
+                    frames.append((level, parent_id, test_name, index))
+                    open_keywords += 1
+                    
+                    # Nested keywords are one level deeper below this keyword
+                    level += 1
+                    parent_id = keywords.add_parent(keyword_name, parent_id)
+                elif tag == 'test':
+                    if not suite_depth:
+                        continue
+                    frames.append((level, parent_id, test_name, None))
+                    test_name = element.get('name', 'Unknown Test')
+                    parent_id = keywords.add_parent(test_name)
+                elif tag == 'suite':
+                    if robot_found:
+                        suite_depth += 1
+                elif tag == 'robot':
+                    robot_found = True
+                continue
             
-            # Store keyword information
-            keyword_info = {
-                'name': keyword_name,
-                'type': keyword_type,
-                'library': keyword_library,
-                'level': level,
-                'parent': parent_name,
-                'test_name': test_name,
-                'start_time': start_time,
-                'end_time': end_time,
-                'status': status,
-                'arguments': arguments,
-                'return_values': return_values,
-                'execution_order': len(self.keywords) + 1
-            }
+            if tag == 'kw' or tag == 'test':
+                if not suite_depth:
+                    continue
+                level, parent_id, test_name, index = frames.pop()
+                if index is not None:
+                    self._fill_keyword_result(index, element)
+                    open_keywords -= 1
+            elif tag == 'suite' and suite_depth:
+                suite_depth -= 1
+            else:
+                continue
             
-            self.keywords.append(keyword_info)
+            # Release the finished subtree; with ElementTree the emptied element
+            # stays in its parent until the parent itself is cleared
+            element.clear()
+            if detach:
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
             
-            # Update parent name for nested keywords
-            current_parent = f"{parent_name}.{keyword_name}" if parent_name else keyword_name
-        
-        # Check if this is a test case
-        elif element.tag == 'test':
-            test_name = element.get('name', 'Unknown Test')
-            current_parent = test_name
-        
-        # Recursively process child elements
-        for child in element:
-            if element.tag == 'test':
-                self.extract_keywords_recursive(child, level, current_parent, test_name)
-            elif element.tag == 'kw':
-                self.extract_keywords_recursive(child, level + 1, current_parent, test_name)
-            else:
-                self.extract_keywords_recursive(child, level, parent_name, test_name)
+            if tag == 'kw' and not open_keywords:
+                yield len(keywords)
+        
+        yield len(keywords)
+        return robot_found
+    
+    def _cache_path(self) -> str:
+        """Return the cache file for the current path, modification time and size of the input."""
+        stat = os.stat(self.output_file)
+        key = f"{os.path.abspath(self.output_file)}|{stat.st_mtime_ns}|{stat.st_size}|{CACHE_VERSION}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(self.output_file)}.{digest}.pkl")
     
-    def extract_keywords(self) -> List[Dict[str, Any]]:
-        """Extract all keywords from the output.xml file."""
-        root = self.parse_xml()
+    def _load_cache(self, cache_path: str) -> bool:
+        """Load keywords from cache_path, returning False if there is no usable cache."""
+        try:
+            with open(cache_path, 'rb') as f:
+                keywords = KeywordTable(**pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            return False
+        self.keywords = keywords
+        return True
+    
+    def _save_cache(self, cache_path: str) -> None:
+        """
+        Write the keyword table's columns to cache_path.
         
-        # Check if root is robot element or find robot element
-        if root.tag == 'robot':
-            robot_elem = root
-        else:
-            robot_elem = root.find('.//robot')
-            if robot_elem is None:
-                print("Error: No robot element found in the XML file.")
-                sys.exit(1)
+        Pickling the table itself would record its class as __main__.KeywordTable
+        when run as a script, which other importers cannot load. Failures only
+        cost the next run a parse.
+        """
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(self.keywords.columns(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
+    def extract_keywords(self) -> KeywordTable:
+        """
+        Extract all keywords from the output.xml file.
         
-        # Extract keywords from all test suites
-        for suite in robot_elem.findall('.//suite'):
-            self.extract_keywords_recursive(suite)
+        With a cache_dir, the table is reused from a pickle keyed on the file's
+        path, modification time and size, and written there after parsing.
+        """
+        try:
+            cache_path = self._cache_path() if self.cache_dir is not None else None
+            if cache_path is not None and self._load_cache(cache_path):
+                return self.keywords
+            self.stream_keywords()
+            if cache_path is not None:
+                self._save_cache(cache_path)
+        except PARSE_ERRORS as e:
+            print(f"Error parsing XML file: {e}")
+            sys.exit(1)
+        except FileNotFoundError:
+            print(f"Error: File '{self.output_file}' not found.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            sys.exit(1)
         
         return self.keywords
     
+    @staticmethod
+    def _matching_indices(values: array, target: int) -> List[int]:
+        """Return the indices of the entries equal to target."""
+        kernels = _level_kernels() if len(values) >= JIT_MIN_LEVEL_VALUES else None
+        if kernels is not None:
+            match_mask = kernels[0]
+            return np.flatnonzero(match_mask(np.frombuffer(values, dtype=values.typecode),
+                                             target)).tolist()
+        return [i for i, value in enumerate(values) if value == target]
+    
+    def filter_by_status(self, status: str) -> List[int]:
+        """Return indices of keywords with the given status (case-insensitive)."""
+        return list(self.keywords.status_index().get(status.upper(), ()))
+    
+    def filter_by_level(self, level: int) -> List[int]:
+        """Return indices of keywords at the given nesting level."""
+        if not self.keywords:
+            return []
+        return self._matching_indices(self.keywords.levels, level)
+    
+    def max_level(self) -> int:
+        """Return the deepest keyword nesting level (0 when there are no keywords)."""
+        levels = self.keywords.levels
+        if not levels:
+            return 0
+        kernels = _level_kernels() if len(levels) >= JIT_MIN_LEVEL_VALUES else None
+        if kernels is not None:
+            max_value = kernels[1]
+            return int(max_value(np.frombuffer(levels, dtype=levels.typecode)))
+        return max(levels)
+    
     def print_keywords(self, show_details: bool = False, filter_status: str = None) -> None:
         """Print the extracted keywords in execution order."""
         if not self.keywords:
@@ -138,51 +829,84 @@ class RobotKeywordExtractor:
         print(f"\nFound {len(self.keywords)} keywords in execution order:\n")
         print("=" * 80)
         
-        for i, keyword in enumerate(self.keywords, 1):
-            # Filter by status if specified
-            if filter_status and keyword['status'].upper() != filter_status.upper():
-                continue
+        # Filter by status if specified
+        if filter_status:
+            indices = self.filter_by_status(filter_status)
+        else:
+            indices = range(len(self.keywords))
+        
+        # Collect the output and write it in large chunks rather than one print per line
+        keywords = self.keywords
+        lines = []
+        add = lines.append
+        buffered = 0
+        for index in indices:
+            i = index + 1
             
             # Basic information
-            indent = "  " * keyword['level']
-            print(f"{i:3d}. {indent}{keyword['name']}")
+            indent = "  " * keywords.levels[index]
+            line = f"{i:3d}. {indent}{keywords.names[index]}\n"
             
             if show_details:
-                print(f"     Type: {keyword['type']}")
-                if keyword['library']:
-                    print(f"     Library: {keyword['library']}")
-                if keyword['parent']:
-                    print(f"     Parent: {keyword['parent']}")
-                if keyword['test_name']:
-                    print(f"     Test: {keyword['test_name']}")
-                print(f"     Status: {keyword['status']}")
-                if keyword['start_time']:
-                    print(f"     Start: {keyword['start_time']}")
-                if keyword['end_time']:
-                    print(f"     End: {keyword['end_time']}")
-                if keyword['arguments']:
-                    print(f"     Arguments: {', '.join(keyword['arguments'])}")
-                if keyword['return_values']:
-                    print(f"     Returns: {', '.join(keyword['return_values'])}")
-                print()
+                add(line)
+                add(f"     Type: {keywords.types[index]}\n")
+                if keywords.libraries[index]:
+                    add(f"     Library: {keywords.libraries[index]}\n")
+                parent = keywords.parent(index)
+                if parent:
+                    add(f"     Parent: {parent}\n")
+                test_name = keywords.test_name(index)
+                if test_name:
+                    add(f"     Test: {test_name}\n")
+                add(f"     Status: {keywords.status(index)}\n")
+                if keywords.start_times[index]:
+                    add(f"     Start: {keywords.start_times[index]}\n")
+                if keywords.end_times[index]:
+                    add(f"     End: {keywords.end_times[index]}\n")
+                if keywords.arguments[index]:
+                    add(f"     Arguments: {', '.join(keywords.arguments[index])}\n")
+                if keywords.return_values[index]:
+                    add(f"     Returns: {', '.join(keywords.return_values[index])}\n")
+                line = "\n"
+            add(line)
+            
+            buffered += 1
+            if buffered >= PRINT_CHUNK_KEYWORDS:
+                sys.stdout.write(''.join(lines))
+                lines.clear()
+                buffered = 0
+        
+        sys.stdout.write(''.join(lines))
     
     def export_to_csv(self, output_file: str) -> None:
         """Export keywords to CSV file."""
-        import csv
+        fieldnames = ['execution_order', 'name', 'type', 'library', 'level', 
+                     'parent', 'test_name', 'status', 'start_time', 'end_time', 
+                     'arguments', 'return_values']
+        keywords = self.keywords
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['execution_order', 'name', 'type', 'library', 'level', 
-                         'parent', 'test_name', 'status', 'start_time', 'end_time', 
-                         'arguments', 'return_values']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for keyword in self.keywords:
-                # Convert lists to strings for CSV
-                keyword_copy = keyword.copy()
-                keyword_copy['arguments'] = '; '.join(keyword['arguments'])
-                keyword_copy['return_values'] = '; '.join(keyword['return_values'])
-                writer.writerow(keyword_copy)
+        # Build rows straight from the columns
+        rows = zip(
+            range(1, len(keywords) + 1),
+            keywords.names,
+            keywords.types,
+            keywords.libraries,
+            keywords.levels,
+            map(keywords._full_parent, keywords.parent_idx),
+            map(keywords.test_names.__getitem__, keywords.test_idx),
+            map(keywords.status_names.__getitem__, keywords.statuses),
+            keywords.start_times,
+            keywords.end_times,
+            keywords.arguments_joined,
+            keywords.return_values_joined
+        )
+        
+        # A 1 MiB buffer keeps the number of write syscalls low on large exports
+        raw_file = io.BufferedWriter(io.FileIO(output_file, 'wb'), buffer_size=1 << 20)
+        with io.TextIOWrapper(raw_file, encoding='utf-8', newline='', write_through=True) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
         
         print(f"Keywords exported to {output_file}")
 
@@ -210,11 +934,31 @@ def main():
         '-o', '--output',
         help='Export keywords to CSV file'
     )
+    parser.add_argument(
+        '-p', '--parser',
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_BACKEND,
+        help=f'XML parser backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for cached keyword tables (default: a per-user temp directory)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always parse the XML file instead of reusing a cached keyword table'
+    )
     
     args = parser.parse_args()
     
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or default_cache_dir()
+    
     # Create extractor and process the file
-    extractor = RobotKeywordExtractor(args.output_file)
+    extractor = RobotKeywordExtractor(args.output_file, backend=args.parser,
+                                      cache_dir=cache_dir)
     extractor.extract_keywords()
     
     # Print results
@@ -227,8 +971,7 @@ def main():
     # Print summary
     total_keywords = len(extractor.keywords)
     if args.status:
-        filtered_count = len([k for k in extractor.keywords 
-                            if k['status'].upper() == args.status.upper()])
+        filtered_count = len(extractor.filter_by_status(args.status))
         print(f"\nSummary: {filtered_count} keywords with status '{args.status}' out of {total_keywords} total keywords.")
     else:
         print(f"\nSummary: {total_keywords} keywords found in execution order.")
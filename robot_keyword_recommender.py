@@ -6,16 +6,169 @@ This system analyzes keyword usage patterns from Robot Framework output.xml file
 and provides intelligent recommendations for next keywords with autocomplete functionality.
 """
 
+import atexit
 import json
+import os
 import pickle
-from collections import defaultdict, Counter
-from typing import List, Dict, Tuple, Set, Optional
+import heapq
+import functools
+from bisect import bisect_left
+from operator import attrgetter, itemgetter
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from typing import List, Dict, Tuple, Set, Optional, Callable, NamedTuple
 import re
 from dataclasses import dataclass
 from robot_keyword_extractor import RobotKeywordExtractor
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
 
-@dataclass
+# numpy and numba are optional and imported by _jit_kernels() on first use
+np = None
+numba = None
+
+
+# Below these sizes numpy and numba are not used, as importing them, loading
+# the cached kernels (about 0.3 s once per process) and converting the
+# inputs costs more than the Python loops they replace
+JIT_MIN_SEQUENCE_VALUES = 500000
+JIT_MIN_CONTEXT_CANDIDATES = 64
+JIT_MIN_KEYWORDS = 10000
+
+# Compiled kernels: (count_transitions, context_next_ids), () when numba is missing
+_JIT_KERNELS = None
+
+
+def _jit_kernels() -> Optional[Tuple[Callable, Callable]]:
+    """
+    Return the compiled kernels, or None when numba is not installed.
+    
+    Importing numpy and numba takes about 0.2 s, so it happens on the first
+    input above one of the JIT_MIN_* sizes rather than with this module.
+    """
+    global np, numba, _JIT_KERNELS
+    if _JIT_KERNELS is None:
+        try:
+            import numpy as np
+            import numba
+        except ImportError:
+            np = None
+            _JIT_KERNELS = ()
+            return None
+        
+        @numba.njit(cache=True)
+        def count_transitions(values, starts):
+            """Count adjacent keyword id pairs within sequences, in first-seen order."""
+            capacity = 16
+            while capacity < 2 * values.shape[0]:
+                capacity *= 2
+            mask = capacity - 1
+            
+            # Open addressing table from pair key to its index in first-seen order
+            slots = np.full(capacity, -1, dtype=np.int64)
+            keys = np.empty(values.shape[0], dtype=np.int64)
+            counts = np.zeros(values.shape[0], dtype=np.int32)
+            pairs = 0
+            for seq_id in range(starts.shape[0] - 1):
+                for i in range(starts[seq_id], starts[seq_id + 1] - 1):
+                    key = (np.int64(values[i]) << 32) | np.int64(values[i + 1])
+                    slot = (key * 0x5BD1E995) >> 16 & mask
+                    while slots[slot] >= 0 and keys[slots[slot]] != key:
+                        slot = (slot + 1) & mask
+                    if slots[slot] < 0:
+                        slots[slot] = pairs
+                        keys[pairs] = key
+                        pairs += 1
+                    counts[slots[slot]] += 1
+            
+            prev_ids = (keys[:pairs] >> 32).astype(np.int32)
+            next_ids = (keys[:pairs] & 0xFFFFFFFF).astype(np.int32)
+            return prev_ids, next_ids, counts[:pairs]
+        
+        @numba.njit(cache=True)
+        def context_next_ids(values, starts, candidates, candidate_first, post_seqs, post_first,
+                             other_starts, other_ends):
+            """
+            Return the keyword id following the context in each candidate sequence.
+            
+            Each other context keyword is looked up in its posting list
+            (other_starts/other_ends into post_seqs/post_first) by binary search.
+            Candidates come in increasing sequence id order, so every search
+            starts where the previous one for that keyword ended. The context
+            ends at the latest first position of its keywords; -1 marks
+            candidates that lack one of them or end with the context.
+            """
+            lows = other_starts.copy()
+            result = np.full(candidates.shape[0], -1, dtype=np.int32)
+            for c in range(candidates.shape[0]):
+                seq_id = candidates[c]
+                last = candidate_first[c]
+                found_all = True
+                for k in range(lows.shape[0]):
+                    low = lows[k]
+                    high = other_ends[k]
+                    while low < high:
+                        middle = (low + high) // 2
+                        if post_seqs[middle] < seq_id:
+                            low = middle + 1
+                        else:
+                            high = middle
+                    lows[k] = low
+                    if low == other_ends[k] or post_seqs[low] != seq_id:
+                        found_all = False
+                        break
+                    if post_first[low] > last:
+                        last = post_first[low]
+                start = starts[seq_id]
+                if found_all and start + last + 1 < starts[seq_id + 1]:
+                    result[c] = values[start + last + 1]
+            return result
+        
+        _JIT_KERNELS = (count_transitions, context_next_ids)
+    return _JIT_KERNELS or None
+
+
+def _int_array(values) -> array:
+    """Copy a numpy int32 array into an array('i')."""
+    result = array('i')
+    result.frombytes(values.astype(np.int32).tobytes())
+    return result
+
+
+def _count_transitions(seq_values: array, seq_starts: array) -> Tuple[array, array, array]:
+    """
+    Count how often each keyword id follows another within the sequences.
+    
+    Args:
+        seq_values: Keyword ids of all sequences, concatenated
+        seq_starts: Offset of each sequence in seq_values, plus the total length
+        
+    Returns:
+        Arrays of previous ids, next ids and counts, one entry per distinct
+        pair in the order the pairs first occur
+    """
+    kernels = _jit_kernels() if len(seq_values) >= JIT_MIN_SEQUENCE_VALUES else None
+    if kernels is not None:
+        count_transitions = kernels[0]
+        prev_ids, next_ids, counts = count_transitions(
+            np.frombuffer(seq_values, dtype=np.int32), np.frombuffer(seq_starts, dtype=np.int32))
+        return _int_array(prev_ids), _int_array(next_ids), _int_array(counts)
+    
+    transitions = {}
+    for seq_id in range(len(seq_starts) - 1):
+        sequence = seq_values[seq_starts[seq_id]:seq_starts[seq_id + 1]]
+        for pair in zip(sequence, sequence[1:]):
+            transitions[pair] = transitions.get(pair, 0) + 1
+    return (array('i', (prev_id for prev_id, _ in transitions)),
+            array('i', (next_id for _, next_id in transitions)),
+            array('i', transitions.values()))
+
+
+@dataclass(frozen=True)
 class KeywordRecommendation:
     """Represents a keyword recommendation with confidence score and context."""
     keyword: str
@@ -23,82 +176,692 @@ class KeywordRecommendation:
     confidence: float
     context: str
     usage_count: int
-    next_keywords: List[str]
+    next_keywords: Tuple[str, ...]
+
+
+class _KeywordFrequencies:
+    """
+    Counter-like view of a KeywordPatternAnalyzer's keyword frequencies by name.
+    
+    The counts live in the analyzer's array indexed by keyword id; this view
+    provides the lookups and most_common() of the Counter that used to hold
+    them. Keywords that were never seen count as 0, and assigning a count to
+    one raises KeyError.
+    """
+    __slots__ = ('_analyzer',)
+    
+    def __init__(self, analyzer: 'KeywordPatternAnalyzer'):
+        self._analyzer = analyzer
+    
+    def __getitem__(self, keyword: str) -> int:
+        kw_id = self._analyzer._kw_id.get(keyword)
+        return 0 if kw_id is None else self._analyzer._kw_freq[kw_id]
+    
+    def __setitem__(self, keyword: str, count: int):
+        # New keywords need a library and context entries, so only training adds them
+        analyzer = self._analyzer
+        analyzer._kw_freq[analyzer._kw_id[keyword]] = count
+        analyzer._finalized = False
+    
+    def get(self, keyword: str, default: Optional[int] = None) -> Optional[int]:
+        kw_id = self._analyzer._kw_id.get(keyword)
+        return default if kw_id is None else self._analyzer._kw_freq[kw_id]
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._analyzer._kw_id
+    
+    def __iter__(self):
+        return iter(self._analyzer._id_kw)
+    
+    def __len__(self) -> int:
+        return len(self._analyzer._id_kw)
+    
+    def keys(self) -> List[str]:
+        return list(self._analyzer._id_kw)
+    
+    def values(self) -> List[int]:
+        return self._analyzer._kw_freq.tolist()
+    
+    def items(self) -> List[Tuple[str, int]]:
+        return list(zip(self._analyzer._id_kw, self._analyzer._kw_freq))
+    
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """List the n most common keywords and their counts, ties in first-seen order."""
+        id_kw = self._analyzer._id_kw
+        kw_freq = self._analyzer._kw_freq
+        if n is None:
+            kw_ids = sorted(range(len(kw_freq)), key=kw_freq.__getitem__, reverse=True)
+        elif (0 < n < len(kw_freq) and len(kw_freq) >= JIT_MIN_KEYWORDS
+              and _jit_kernels() is not None):
+            counts = np.frombuffer(kw_freq, dtype=np.int32)
+            # Every count above the n-th largest is taken, and as many of the
+            # ones equal to it as fit, lowest ids first
+            threshold = np.partition(counts, len(counts) - n)[len(counts) - n]
+            above = np.flatnonzero(counts > threshold)
+            equal = np.flatnonzero(counts == threshold)[:n - len(above)]
+            kw_ids = np.concatenate((above, equal))
+            kw_ids = kw_ids[np.argsort(-counts[kw_ids], kind='stable')].tolist()
+        else:
+            kw_ids = heapq.nlargest(n, range(len(kw_freq)), key=kw_freq.__getitem__)
+        return [(id_kw[kw_id], kw_freq[kw_id]) for kw_id in kw_ids]
+
+
+class _SuffixArray:
+    """
+    Generalized suffix array returning the top-ranked strings containing a substring.
+    
+    The suffixes of all strings are kept in sorted order as two flat arrays:
+    suffix i is strings[ids[i]][offsets[i]:]. The suffixes starting with a
+    query form one range, found by binary search. Collecting the strings of
+    a range costs its length, while scanning the strings in rank order until
+    limit of them match costs about limit * len(strings) / matches, so large
+    ranges are answered by the scan instead.
+    """
+    
+    def __init__(self, strings: List[str], order: List[int],
+                 ids: Optional[array] = None, offsets: Optional[array] = None):
+        """
+        Index strings for substring search.
+        
+        Args:
+            strings: Strings to search, indexed by id
+            order: Every string id, best ranked first
+            ids: String ids of the sorted suffixes from an earlier index of the
+                 same strings, reused instead of sorting the suffixes again
+            offsets: Suffix offsets matching ids
+        """
+        self.strings = strings
+        self.order = order
+        self.rank_of = array('i', bytes(array('i').itemsize * len(order)))
+        for position, string_id in enumerate(order):
+            self.rank_of[string_id] = position
+        if ids is not None:
+            self.ids = ids
+            self.offsets = offsets
+            return
+        
+        ids = array('i')
+        offsets = array('i')
+        suffixes = []
+        for string_id, string in enumerate(strings):
+            for offset in range(len(string)):
+                ids.append(string_id)
+                offsets.append(offset)
+                suffixes.append(string[offset:])
+        sorted_order = sorted(range(len(suffixes)), key=suffixes.__getitem__)
+        self.ids = array('i', (ids[i] for i in sorted_order))
+        self.offsets = array('i', (offsets[i] for i in sorted_order))
+    
+    def _bound(self, substring: str, upper: bool) -> int:
+        """Return the first suffix whose start is above (upper) or not below substring."""
+        strings, ids, offsets = self.strings, self.ids, self.offsets
+        length = len(substring)
+        low, high = 0, len(ids)
+        while low < high:
+            middle = (low + high) // 2
+            offset = offsets[middle]
+            start = strings[ids[middle]][offset:offset + length]
+            if start < substring or (upper and start == substring):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def top(self, substring: str, limit: int,
+            accept: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """Return up to limit accepted string ids containing substring, best first."""
+        if substring:
+            low = self._bound(substring, False)
+            high = self._bound(substring, True)
+        if not substring or (high - low) ** 2 > limit * len(self.strings):
+            strings = self.strings
+            result = []
+            for string_id in self.order:
+                if substring in strings[string_id] and (accept is None or accept(string_id)):
+                    result.append(string_id)
+                    if len(result) == limit:
+                        break
+            return result
+        
+        rank_of = self.rank_of
+        positions = {rank_of[string_id] for string_id in self.ids[low:high]}
+        order = self.order
+        if accept is not None:
+            positions = (position for position in positions if accept(order[position]))
+        return [order[position] for position in heapq.nsmallest(limit, positions)]
+
+
+class PartialPatterns(NamedTuple):
+    """
+    The patterns of one output file, using file-local keyword and context ids.
+    
+    Built by _extract_partial in worker processes during training, so it
+    holds flat lists and arrays that are cheap to send back rather than
+    nested dictionaries.
+    """
+    keywords: List[str]  # Names by local id, in first-seen order
+    libraries: List[str]  # Library by local id
+    library_pairs: List[Tuple[str, int]]  # (library, local id) pairs in first-seen order
+    frequencies: array  # Frequency by local id
+    context_strings: List[str]  # Context strings by local context id
+    contexts: List[List[int]]  # Local context ids by local id
+    trans_prev: array  # Previous id of each distinct transition, in first-seen order
+    trans_next: array  # Next id of each transition
+    trans_counts: array  # Number of times each transition occurs
+    seq_values: array  # Local ids of all sequences, concatenated
+    seq_starts: array  # Offset of each sequence in seq_values, plus the total length
+
+
+def _extract_partial(output_file: str) -> PartialPatterns:
+    """
+    Extract the patterns of one output file using file-local ids.
+    
+    Args:
+        output_file: Path to the output.xml file
+        
+    Returns:
+        The file's patterns, to be added to a model with merge_partial()
+    """
+    extractor = RobotKeywordExtractor(output_file)
+    keywords = extractor.iter_keywords(records=True)
+    
+    # Extract sequences and patterns
+    local_ids = {}
+    libraries = []
+    library_pairs = {}
+    frequencies = array('i')
+    context_ids = {}
+    contexts = []
+    seq_values = array('i')
+    seq_starts = array('i', [0])
+    current_sequence = []
+    current_context = ""
+    
+    # Bound methods used for every keyword
+    get_local_id = local_ids.get
+    get_context_id = context_ids.get
+    
+    for keyword_name, keyword_type, library, level in keywords:
+        library = library or 'BuiltIn'
+        
+        keyword_id = get_local_id(keyword_name)
+        if keyword_id is None:
+            keyword_id = local_ids[keyword_name] = len(libraries)
+            libraries.append(library)
+            frequencies.append(0)
+            contexts.append({})
+        
+        # Update context based on nesting level
+        if level == 0:
+            current_context = keyword_name
+        elif level == 1:
+            current_context = f"{current_context}.{keyword_name}"
+        
+        # Store keyword information
+        libraries[keyword_id] = library
+        library_pairs[(library, keyword_id)] = None
+        frequencies[keyword_id] += 1
+        context_id = get_context_id(current_context)
+        if context_id is None:
+            context_id = context_ids[current_context] = len(context_ids)
+        contexts[keyword_id][context_id] = None
+        
+        current_sequence.append(keyword_id)
+        
+        # Reset sequence on test case boundaries
+        if level == 0 and (keyword_type == 'SETUP' or keyword_type == 'TEARDOWN'):
+            if len(current_sequence) > 1:
+                seq_values.extend(current_sequence)
+                seq_starts.append(len(seq_values))
+            current_sequence = [keyword_id]
+    
+    # Add final sequence
+    if current_sequence:
+        seq_values.extend(current_sequence)
+        seq_starts.append(len(seq_values))
+    
+    # Consecutive sequences share their boundary keyword, so the pairs inside
+    # the sequences are exactly the transitions between consecutive keywords
+    trans_prev, trans_next, trans_counts = _count_transitions(seq_values, seq_starts)
+    return PartialPatterns(
+        keywords=list(local_ids),
+        libraries=libraries,
+        library_pairs=list(library_pairs),
+        frequencies=frequencies,
+        context_strings=list(context_ids),
+        contexts=[list(local_contexts) for local_contexts in contexts],
+        trans_prev=trans_prev,
+        trans_next=trans_next,
+        trans_counts=trans_counts,
+        seq_values=seq_values,
+        seq_starts=seq_starts
+    )
+
+
+# Analyzers reading shared memory blocks. They are kept alive until their
+# views are released, as the blocks cannot be closed while views exist.
+_ATTACHED_ANALYZERS = set()
+
+
+@atexit.register
+def _release_attached_analyzers():
+    """Release the shared columns of every analyzer still attached at exit."""
+    for analyzer in list(_ATTACHED_ANALYZERS):
+        analyzer._release_shared(keep_columns=False)
 
 
 class KeywordPatternAnalyzer:
     """Analyzes keyword usage patterns and builds recommendation models."""
     
+    # Version of the columnar layout written by save_model()
+    MODEL_FORMAT_VERSION = 3
+    # Number of most common transitions kept per keyword by finalize()
+    TOP_TRANSITIONS = 32
+    # Number of query results kept by the recommendation and autocomplete caches
+    QUERY_CACHE_SIZE = 4096
+    # Number of autocomplete suggestions returned per query
+    AUTOCOMPLETE_LIMIT = 20
+    # Model columns placed in shared memory by export_shared(), and the
+    # attributes holding them
+    SHARED_COLUMNS = {
+        'transition_starts': '_trans_starts',
+        'transition_next': '_trans_next',
+        'transition_counts': '_trans_counts',
+        'sequence_values': '_seq_values',
+        'sequence_starts': '_seq_starts',
+        'posting_starts': '_post_starts',
+        'posting_sequences': '_post_seqs',
+        'posting_first': '_post_first',
+        'top_starts': '_top_starts',
+        'top_next': '_top_next',
+        'top_counts': '_top_counts',
+        'transition_totals': '_trans_totals',
+        'context_starts': '_ctx_starts',
+        'context_values': '_ctx_values',
+        'suffix_ids': '_suffix_ids',
+        'suffix_offsets': '_suffix_offsets'
+    }
+    
     def __init__(self):
-        self.keyword_sequences = []  # List of keyword execution sequences
-        self.keyword_transitions = defaultdict(Counter)  # keyword -> next_keyword -> count
-        self.keyword_contexts = defaultdict(set)  # keyword -> set of contexts
-        self.library_keywords = defaultdict(set)  # library -> set of keywords
-        self.keyword_frequencies = Counter()
         self.keyword_libraries = {}  # keyword -> library mapping
+        self._kw_id = {}  # keyword -> interned keyword id
+        self._kw_freq = array('i')  # keyword id -> frequency
+        # Keyword ids of each library: sets while training, packed by finalize()
+        # into sorted arrays
+        self._library_sets = {}
+        self._library_ids = {}
+        self._id_kw = []  # keyword id -> keyword
+        # Transition counts per keyword id: next id -> count dicts while training,
+        # packed by finalize() so that the next ids and counts of keyword k are
+        # at _trans_starts[k]:_trans_starts[k + 1]
+        self._trans_dicts = {}
+        self._trans_starts = array('i', [0])
+        self._trans_next = array('i')
+        self._trans_counts = array('i')
+        self._seq_values = array('i')  # Keyword ids of all sequences, concatenated
+        self._seq_starts = array('i', [0])  # Offset of each sequence in _seq_values
+        # Contexts each keyword was used in: context ids of keyword k are at
+        # _ctx_starts[k]:_ctx_starts[k + 1], packed by finalize() from _ctx_sets
+        self._ctx_id = {}  # context -> interned context id
+        self._ctx_strings = []  # context id -> context
+        self._ctx_starts = array('i', [0])
+        self._ctx_values = array('i')
+        self._ctx_sets = {}  # keyword id -> context ids seen while training, in order
+        self._suffix_array = None  # Suffixes of the lowercased keywords, built by finalize()
+        # Sorted suffix columns of _suffix_array, kept until keywords are added
+        self._suffix_ids = None
+        self._suffix_offsets = None
+        # Per keyword id lookups for autocomplete, built by finalize()
+        self._kw_lower = []
+        self._kw_library = []
+        # Most common transitions per keyword id, in rank order, built by finalize():
+        # the ids and counts of keyword k are at _top_starts[k]:_top_starts[k + 1]
+        self._top_starts = None
+        self._top_next = None
+        self._top_counts = None
+        self._trans_totals = None  # keyword id -> total number of transitions from it
+        self._library_totals = None  # library -> summed frequency of its keywords
+        self._library_statistics = None  # Statistics behind get_library_statistics, reset by finalize()
+        # Context index built by finalize(): the sorted ids of the sequences that
+        # contain keyword k, and its first position in each of them, are at
+        # _post_starts[k]:_post_starts[k + 1]
+        self._post_starts = None
+        self._post_seqs = None
+        self._post_first = None
+        self._finalized = False
+        # Query caches, cleared by finalize() whenever the model changes
+        self._cached_recommendations = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(
+            self._get_recommendations)
+        self._cached_autocomplete = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(
+            self._get_autocomplete_matches)
+        self._incomplete_matches = {}  # (prefix, library) -> matches, when fewer than the limit
+        self._shared_blocks = []  # SharedMemory blocks backing the columns after attach_shared()
+    
+    @property
+    def keyword_frequencies(self) -> _KeywordFrequencies:
+        """Keyword frequencies by name, read from the per-id frequency array."""
+        return _KeywordFrequencies(self)
+    
+    @property
+    def keyword_sequences(self) -> List[List[str]]:
+        """Keyword execution sequences, decoded from the interned sequence arrays."""
+        id_kw = self._id_kw
+        values = self._seq_values
+        starts = self._seq_starts
+        return [[id_kw[kw_id] for kw_id in values[starts[i]:starts[i + 1]]]
+                for i in range(len(starts) - 1)]
+    
+    @property
+    def keyword_transitions(self) -> Dict[str, Dict[str, int]]:
+        """Transition counts keyword -> next keyword -> count, decoded from the transition arrays."""
+        id_kw = self._id_kw
+        keyword_transitions = {}
+        for kw_id, keyword in enumerate(id_kw):
+            transitions = self._transitions_of(kw_id)
+            if transitions:
+                keyword_transitions[keyword] = {id_kw[next_id]: count
+                                                for next_id, count in transitions}
+        return keyword_transitions
+    
+    def _transitions_of(self, kw_id: int) -> List[Tuple[int, int]]:
+        """Return the (next keyword id, count) pairs of a keyword id, in first-seen order."""
+        if self._trans_dicts is not None:
+            return list(self._trans_dicts.get(kw_id, {}).items())
+        start, end = self._trans_starts[kw_id], self._trans_starts[kw_id + 1]
+        return list(zip(self._trans_next[start:end], self._trans_counts[start:end]))
+    
+    def _unpack_transitions(self):
+        """Turn the packed transition arrays back into per-keyword dicts for further training."""
+        if self._trans_dicts is None:
+            self._trans_dicts = {kw_id: dict(self._transitions_of(kw_id))
+                                 for kw_id in range(len(self._trans_starts) - 1)}
+    
+    def _pack_transitions(self):
+        """Pack the per-keyword transition dicts into the flat transition arrays."""
+        trans_starts = array('i', [0])
+        trans_next = array('i')
+        trans_counts = array('i')
+        for kw_id in range(len(self._id_kw)):
+            transitions = self._trans_dicts.get(kw_id, {})
+            trans_next.extend(transitions)
+            trans_counts.extend(transitions.values())
+            trans_starts.append(len(trans_next))
+        self._trans_starts = trans_starts
+        self._trans_next = trans_next
+        self._trans_counts = trans_counts
+        self._trans_dicts = None
+    
+    @property
+    def keyword_contexts(self) -> Dict[str, Set[str]]:
+        """Contexts each keyword was used in, decoded from the packed context arrays."""
+        return {keyword: set(self._contexts_of(kw_id)) for kw_id, keyword in enumerate(self._id_kw)}
+    
+    def _contexts_of(self, kw_id: int) -> List[str]:
+        """Return the contexts a keyword id was used in, in first-seen order."""
+        ctx_strings = self._ctx_strings
+        if self._ctx_sets is not None:
+            return [ctx_strings[ctx_id] for ctx_id in self._ctx_sets.get(kw_id, ())]
+        start, end = self._ctx_starts[kw_id], self._ctx_starts[kw_id + 1]
+        return [ctx_strings[ctx_id] for ctx_id in self._ctx_values[start:end]]
+    
+    def _unpack_contexts(self):
+        """Turn the packed context arrays back into per-keyword sets for further training."""
+        if self._ctx_sets is None:
+            ctx_starts = self._ctx_starts
+            ctx_values = self._ctx_values
+            self._ctx_sets = {
+                kw_id: dict.fromkeys(ctx_values[ctx_starts[kw_id]:ctx_starts[kw_id + 1]])
+                for kw_id in range(len(ctx_starts) - 1)}
+    
+    def _pack_contexts(self):
+        """Pack the per-keyword context sets into the flat context arrays."""
+        ctx_starts = array('i', [0])
+        ctx_values = array('i')
+        for kw_id in range(len(self._id_kw)):
+            ctx_values.extend(self._ctx_sets.get(kw_id, ()))
+            ctx_starts.append(len(ctx_values))
+        self._ctx_starts = ctx_starts
+        self._ctx_values = ctx_values
+        self._ctx_sets = None
+    
+    def _set_contexts(self, keyword_contexts: Dict[str, List[str]]):
+        """Replace the contexts with a keyword -> contexts mapping of names."""
+        self._ctx_id = {}
+        self._ctx_strings = []
+        self._ctx_sets = {}
+        for keyword, contexts in keyword_contexts.items():
+            ctx_set = self._ctx_sets.setdefault(self._intern(keyword), {})
+            for context in contexts:
+                ctx_set[self._intern_context(context)] = None
+    
+    def _intern_context(self, context: str) -> int:
+        """Return the id of a context, assigning the next free id to new contexts."""
+        ctx_id = self._ctx_id.get(context)
+        if ctx_id is None:
+            ctx_id = self._ctx_id[context] = len(self._ctx_strings)
+            self._ctx_strings.append(context)
+        return ctx_id
+    
+    @property
+    def library_keywords(self) -> Dict[str, List[str]]:
+        """Keywords of each library, in first-seen order."""
+        if not self._finalized:
+            self.finalize()
+        id_kw = self._id_kw
+        return {library: [id_kw[kw_id] for kw_id in kw_ids]
+                for library, kw_ids in self._library_ids.items()}
+    
+    def _unpack_libraries(self):
+        """Turn the packed library arrays back into sets for further training."""
+        if self._library_sets is None:
+            self._library_sets = {library: set(kw_ids)
+                                  for library, kw_ids in self._library_ids.items()}
+    
+    @property
+    def library_totals(self) -> Dict[str, int]:
+        """Summed frequency of the keywords of each library."""
+        if not self._finalized:
+            self.finalize()
+        return self._library_totals
+    
+    @property
+    def sequence_count(self) -> int:
+        """Number of keyword execution sequences."""
+        return len(self._seq_starts) - 1
+    
+    def _intern(self, keyword: str) -> int:
+        """Return the id of keyword, assigning the next free id to new keywords."""
+        kw_id = self._kw_id.get(keyword)
+        if kw_id is None:
+            kw_id = self._kw_id[keyword] = len(self._id_kw)
+            self._id_kw.append(keyword)
+            self._kw_freq.append(0)
+        return kw_id
+    
+    def _add_sequence(self, sequence: List[int]):
+        """Append a sequence of keyword ids to the sequence arrays."""
+        self._seq_values.extend(sequence)
+        self._seq_starts.append(len(self._seq_values))
+        
+    def finalize(self):
+        """Build the lookup structures used to answer queries after training or loading."""
+        self._kw_lower = [keyword.lower() for keyword in self._id_kw]
+        self._kw_library = [self.keyword_libraries[keyword] for keyword in self._id_kw]
+        
+        # Autocomplete matches substrings, so every suffix of a keyword is indexed.
+        # Keywords are ranked by frequency, then length, then first appearance,
+        # like the original stable sort of keyword_libraries.
+        kw_freq = self._kw_freq
+        id_kw = self._id_kw
+        order = sorted(range(len(id_kw)), key=lambda kw_id: (-kw_freq[kw_id], -len(id_kw[kw_id])))
+        self._suffix_array = _SuffixArray(self._kw_lower, order,
+                                          self._suffix_ids, self._suffix_offsets)
+        self._suffix_ids = self._suffix_array.ids
+        self._suffix_offsets = self._suffix_array.offsets
+        
+        if self._trans_dicts is not None:
+            self._pack_transitions()
+        if self._top_starts is None:
+            self._build_top_transitions()
+        if self._post_starts is None:
+            self._build_context_index()
+        if self._ctx_sets is not None:
+            self._pack_contexts()
+        
+        if self._library_sets is not None:
+            self._library_ids = {library: array('i', sorted(kw_ids))
+                                 for library, kw_ids in self._library_sets.items()}
+            self._library_sets = None
+        kw_freq = self._kw_freq
+        self._library_totals = {library: sum(kw_freq[kw_id] for kw_id in kw_ids)
+                                for library, kw_ids in self._library_ids.items()}
+        
+        self._cached_recommendations.cache_clear()
+        self._cached_autocomplete.cache_clear()
+        self._incomplete_matches = {}
+        self._library_statistics = None
+        self._finalized = True
+    
+    def _build_top_transitions(self):
+        """Build the per-keyword tables of most common transitions."""
+        top_starts = array('i', [0])
+        top_next = array('i')
+        top_counts = array('i')
+        trans_totals = array('i')
+        for kw_id in range(len(self._id_kw)):
+            transitions = self._transitions_of(kw_id)
+            if transitions:
+                trans_totals.append(sum(count for _, count in transitions))
+                for next_id, count in heapq.nlargest(self.TOP_TRANSITIONS, transitions,
+                                                     key=itemgetter(1)):
+                    top_next.append(next_id)
+                    top_counts.append(count)
+            else:
+                trans_totals.append(0)
+            top_starts.append(len(top_next))
+        self._top_starts = top_starts
+        self._top_next = top_next
+        self._top_counts = top_counts
+        self._trans_totals = trans_totals
+    
+    def _build_context_index(self):
+        """Build the keyword -> sequence posting lists used by context recommendations."""
+        values = self._seq_values
+        starts = self._seq_starts
+        postings = [array('i') for _ in self._id_kw]
+        first_pos = [array('i') for _ in self._id_kw]
+        for seq_id in range(len(starts) - 1):
+            # First position of each keyword id in the sequence
+            positions = {}
+            for position, kw_id in enumerate(values[starts[seq_id]:starts[seq_id + 1]]):
+                if kw_id not in positions:
+                    positions[kw_id] = position
+            for kw_id, position in positions.items():
+                postings[kw_id].append(seq_id)
+                first_pos[kw_id].append(position)
         
+        post_starts = array('i', [0])
+        post_seqs = array('i')
+        post_first = array('i')
+        for kw_postings, kw_first_pos in zip(postings, first_pos):
+            post_seqs.extend(kw_postings)
+            post_first.extend(kw_first_pos)
+            post_starts.append(len(post_seqs))
+        self._post_starts = post_starts
+        self._post_seqs = post_seqs
+        self._post_first = post_first
+    
     def analyze_output_file(self, output_file: str):
         """Analyze a Robot Framework output.xml file and extract patterns."""
-        extractor = RobotKeywordExtractor(output_file)
-        keywords = extractor.extract_keywords()
+        self.merge_partial(_extract_partial(output_file))
+    
+    def merge_partial(self, partial: PartialPatterns):
+        """
+        Add the patterns extracted from one output file by _extract_partial.
         
-        # Extract sequences and patterns
-        current_sequence = []
-        current_context = ""
+        Args:
+            partial: Patterns returned by _extract_partial
+        """
+        self._release_shared()
+        self._finalized = False
+        self._top_starts = None
+        self._post_starts = None
+        self._suffix_ids = None
+        self._unpack_contexts()
+        self._unpack_libraries()
+        self._unpack_transitions()
         
-        for keyword in keywords:
-            keyword_name = keyword['name']
-            library = keyword['library'] or 'BuiltIn'
-            level = keyword['level']
-            
-            # Update context based on nesting level
-            if level == 0:
-                current_context = keyword_name
-            elif level == 1:
-                current_context = f"{current_context}.{keyword_name}"
-            
-            # Store keyword information
+        # Map the file's keyword and context ids to the model's ids
+        ids = []
+        for keyword_name, library in zip(partial.keywords, partial.libraries):
+            ids.append(self._intern(keyword_name))
             self.keyword_libraries[keyword_name] = library
-            self.library_keywords[library].add(keyword_name)
-            self.keyword_frequencies[keyword_name] += 1
-            self.keyword_contexts[keyword_name].add(current_context)
-            
-            # Build transition patterns
-            if current_sequence:
-                prev_keyword = current_sequence[-1]
-                self.keyword_transitions[prev_keyword][keyword_name] += 1
-            
-            current_sequence.append(keyword_name)
-            
-            # Reset sequence on test case boundaries
-            if keyword['type'] in ['SETUP', 'TEARDOWN'] and level == 0:
-                if len(current_sequence) > 1:
-                    self.keyword_sequences.append(current_sequence)
-                current_sequence = [keyword_name]
+        ctx_ids = [self._intern_context(context) for context in partial.context_strings]
+        
+        for library, local_id in partial.library_pairs:
+            kw_ids = self._library_sets.get(library)
+            if kw_ids is None:
+                kw_ids = self._library_sets[library] = set()
+            kw_ids.add(ids[local_id])
+        kw_freq = self._kw_freq
+        for kw_id, frequency in zip(ids, partial.frequencies):
+            kw_freq[kw_id] += frequency
+        for local_id, local_contexts in enumerate(partial.contexts):
+            ctx_set = self._ctx_sets.get(ids[local_id])
+            if ctx_set is None:
+                ctx_set = self._ctx_sets[ids[local_id]] = {}
+            for local_ctx_id in local_contexts:
+                ctx_set[ctx_ids[local_ctx_id]] = None
         
-        # Add final sequence
-        if current_sequence:
-            self.keyword_sequences.append(current_sequence)
+        trans_dicts = self._trans_dicts
+        for prev_id, next_id, count in zip(partial.trans_prev, partial.trans_next,
+                                           partial.trans_counts):
+            transitions = trans_dicts.get(ids[prev_id])
+            if transitions is None:
+                transitions = trans_dicts[ids[prev_id]] = {}
+            next_id = ids[next_id]
+            transitions[next_id] = transitions.get(next_id, 0) + count
+        
+        offset = len(self._seq_values)
+        self._seq_values.extend(ids[local_id] for local_id in partial.seq_values)
+        self._seq_starts.extend(offset + start for start in partial.seq_starts[1:])
     
     def get_recommendations(self, current_keyword: str, context: str = "", 
                           max_recommendations: int = 10) -> List[KeywordRecommendation]:
         """Get keyword recommendations based on current keyword and context."""
+        if not self._finalized:
+            self.finalize()
+        try:
+            hash(context)
+        except TypeError:
+            # The context is only echoed back, so a JSON list or object is
+            # accepted as well; it just cannot be a cache key
+            return list(self._get_recommendations(current_keyword, context, max_recommendations))
+        return list(self._cached_recommendations(current_keyword, context, max_recommendations))
+    
+    def _get_recommendations(self, current_keyword: str, context: str,
+                             max_recommendations: int) -> Tuple[KeywordRecommendation, ...]:
+        """Compute the recommendations returned by get_recommendations."""
         recommendations = []
         
         # Get direct transitions
-        if current_keyword in self.keyword_transitions:
-            transitions = self.keyword_transitions[current_keyword]
-            total_count = sum(transitions.values())
+        kw_id = self._kw_id.get(current_keyword)
+        if kw_id is not None and self._trans_totals[kw_id]:
+            total_count = self._trans_totals[kw_id]
+            if max_recommendations > self.TOP_TRANSITIONS:
+                top_transitions = [(self._id_kw[next_id], count) for next_id, count in
+                                   heapq.nlargest(max_recommendations, self._transitions_of(kw_id),
+                                                  key=itemgetter(1))]
+            else:
+                top_transitions = self._top_transitions(kw_id, max_recommendations)
             
-            for next_keyword, count in transitions.most_common(max_recommendations):
+            for next_keyword, count in top_transitions:
                 confidence = count / total_count
                 library = self.keyword_libraries.get(next_keyword, 'BuiltIn')
                 
                 # Get common next keywords for this recommendation
-                next_keywords = []
-                if next_keyword in self.keyword_transitions:
-                    next_keywords = [kw for kw, _ in 
-                                   self.keyword_transitions[next_keyword].most_common(3)]
+                next_keywords = tuple(kw for kw, _ in
+                                      self._top_transitions(self._kw_id[next_keyword], 3))
                 
                 recommendation = KeywordRecommendation(
                     keyword=next_keyword,
@@ -113,46 +876,107 @@ class KeywordPatternAnalyzer:
         # If no direct transitions, suggest popular keywords from same library
         if not recommendations and current_keyword in self.keyword_libraries:
             current_library = self.keyword_libraries[current_keyword]
-            library_keywords = self.library_keywords.get(current_library, set())
+            current_id = self._kw_id[current_keyword]
             
-            for keyword in library_keywords:
-                if keyword != current_keyword:
+            for kw_id in self._library_ids.get(current_library, ()):
+                if kw_id != current_id:
                     confidence = 0.1  # Lower confidence for library-based suggestions
                     recommendation = KeywordRecommendation(
-                        keyword=keyword,
+                        keyword=self._id_kw[kw_id],
                         library=current_library,
                         confidence=confidence,
                         context=context,
-                        usage_count=self.keyword_frequencies[keyword],
-                        next_keywords=[]
+                        usage_count=self._kw_freq[kw_id],
+                        next_keywords=()
                     )
                     recommendations.append(recommendation)
+            
+            # Sort by confidence and usage count; direct transitions already
+            # arrive in this order
+            recommendations.sort(key=attrgetter('confidence', 'usage_count'), reverse=True)
+        
+        return tuple(recommendations[:max_recommendations])
+    
+    def _top_transitions(self, kw_id: int, limit: int) -> List[Tuple[str, int]]:
+        """Return up to limit of the most common (next_keyword, count) pairs of a keyword id."""
+        start = self._top_starts[kw_id]
+        end = min(self._top_starts[kw_id + 1], start + max(limit, 0))
+        id_kw = self._id_kw
+        return [(id_kw[next_id], count) for next_id, count in
+                zip(self._top_next[start:end], self._top_counts[start:end])]
+    
+    def get_library_statistics(self) -> Dict:
+        """
+        Get the keyword count, total usage and top keywords of each library.
         
-        # Sort by confidence and usage count
-        recommendations.sort(key=lambda x: (x.confidence, x.usage_count), reverse=True)
-        return recommendations[:max_recommendations]
+        The statistics are computed once per finalized model; every call
+        returns new dictionaries built from them.
+        """
+        if not self._finalized:
+            self.finalize()
+        if self._library_statistics is None:
+            frequencies = self.keyword_frequencies
+            library_totals = self._library_totals
+            self._library_statistics = tuple(
+                (library, len(keywords), library_totals[library],
+                 tuple((kw, frequencies[kw])
+                       for kw in heapq.nlargest(5, keywords, key=frequencies.__getitem__)))
+                for library, keywords in self.library_keywords.items()
+            )
+        
+        return {
+            library: {
+                'keyword_count': keyword_count,
+                'total_usage': total_usage,
+                'top_keywords': [{'keyword': kw, 'count': count} for kw, count in top_keywords]
+            }
+            for library, keyword_count, total_usage, top_keywords in self._library_statistics
+        }
     
     def get_autocomplete_suggestions(self, partial_keyword: str, 
                                    library_filter: str = None) -> List[Dict]:
         """Get autocomplete suggestions for partial keyword input."""
-        suggestions = []
-        partial_lower = partial_keyword.lower()
+        if not self._finalized:
+            self.finalize()
+        if library_filter and not isinstance(library_filter, str):
+            # Library names are strings, so no keyword matches any other filter
+            return []
         
-        for keyword, library in self.keyword_libraries.items():
-            if library_filter and library != library_filter:
-                continue
-                
-            if partial_lower in keyword.lower():
-                suggestions.append({
-                    'keyword': keyword,
-                    'library': library,
-                    'frequency': self.keyword_frequencies[keyword],
-                    'contexts': list(self.keyword_contexts[keyword])
-                })
+        matches = self._cached_autocomplete(partial_keyword.lower(), library_filter or None)
+        return [
+            {
+                'keyword': self._id_kw[kw_id],
+                'library': self._kw_library[kw_id],
+                'frequency': self._kw_freq[kw_id],
+                'contexts': self._contexts_of(kw_id)
+            }
+            for kw_id in matches
+        ]
+    
+    def _get_autocomplete_matches(self, partial_lower: str,
+                                  library_filter: Optional[str]) -> Tuple[int, ...]:
+        """Return the ids of the keywords suggested for a lowercased partial keyword."""
+        # While typing, the previous query is usually this one minus its last
+        # character. If that query found fewer than the limit, every match of
+        # this one is among its matches, already in rank order.
+        shorter = self._incomplete_matches.get((partial_lower[:-1], library_filter))
+        if partial_lower and shorter is not None:
+            kw_lower = self._kw_lower
+            matches = tuple(kw_id for kw_id in shorter if partial_lower in kw_lower[kw_id])
+        else:
+            accept = None
+            if library_filter:
+                kw_library = self._kw_library
+                accept = lambda kw_id: kw_library[kw_id] == library_filter
+            
+            # Top 20 suggestions by frequency and relevance
+            matches = tuple(self._suffix_array.top(partial_lower, self.AUTOCOMPLETE_LIMIT, accept))
         
-        # Sort by frequency and relevance
-        suggestions.sort(key=lambda x: (x['frequency'], len(x['keyword'])), reverse=True)
-        return suggestions[:20]  # Return top 20 suggestions
+        if len(matches) < self.AUTOCOMPLETE_LIMIT:
+            if len(self._incomplete_matches) >= self.QUERY_CACHE_SIZE:
+                self._incomplete_matches.clear()
+            self._incomplete_matches[(partial_lower, library_filter)] = matches
+        return matches
     
     def get_context_recommendations(self, context_keywords: List[str], 
                                   max_recommendations: int = 10) -> List[KeywordRecommendation]:
@@ -160,28 +984,80 @@ class KeywordPatternAnalyzer:
         if not context_keywords:
             return []
         
-        # Find sequences that contain all context keywords
-        matching_sequences = []
-        for sequence in self.keyword_sequences:
-            if all(kw in sequence for kw in context_keywords):
-                matching_sequences.append(sequence)
+        if not self._finalized:
+            self.finalize()
         
-        if not matching_sequences:
-            return []
+        # Only sequences in the posting list of every context keyword can match,
+        # so walk the rarest keyword's list and look each sequence up in the
+        # others' lists, which are sorted by sequence id.
+        context = []
+        for keyword in context_keywords:
+            # Keywords are strings; any other value in a JSON request never matches
+            kw_id = self._kw_id.get(keyword) if isinstance(keyword, str) else None
+            if kw_id is None or self._post_starts[kw_id] == self._post_starts[kw_id + 1]:
+                return []
+            context.append(kw_id)
+        context = list(dict.fromkeys(context))
+        context.sort(key=lambda kw_id: self._post_starts[kw_id + 1] - self._post_starts[kw_id])
+        rarest, others = context[0], context[1:]
         
-        # Find common next keywords after the context
-        next_keyword_counts = Counter()
-        for sequence in matching_sequences:
-            # Find the position after the last context keyword
-            last_context_pos = max(sequence.index(kw) for kw in context_keywords)
-            if last_context_pos + 1 < len(sequence):
-                next_keyword = sequence[last_context_pos + 1]
-                next_keyword_counts[next_keyword] += 1
+        post_seqs = self._post_seqs
+        post_first = self._post_first
+        seq_values = self._seq_values
+        seq_starts = self._seq_starts
+        post_start = self._post_starts[rarest]
+        post_end = self._post_starts[rarest + 1]
+        kernels = _jit_kernels() if post_end - post_start >= JIT_MIN_CONTEXT_CANDIDATES else None
+        if kernels is not None:
+            context_next_ids = kernels[1]
+            post_seqs = np.frombuffer(post_seqs, dtype=np.int32)
+            post_first = np.frombuffer(post_first, dtype=np.int32)
+            next_ids = context_next_ids(
+                np.frombuffer(seq_values, dtype=np.int32),
+                np.frombuffer(seq_starts, dtype=np.int32),
+                post_seqs[post_start:post_end],
+                post_first[post_start:post_end],
+                post_seqs,
+                post_first,
+                np.array([self._post_starts[kw_id] for kw_id in others], dtype=np.int64),
+                np.array([self._post_starts[kw_id + 1] for kw_id in others], dtype=np.int64))
+            next_keyword_counts = Counter(next_ids[next_ids >= 0].tolist())
+        else:
+            next_keyword_counts = Counter()
+            # First position of each other keyword by sequence id. Short posting
+            # lists are read into a dict; long ones are binary searched instead,
+            # as the candidates come in increasing sequence id order
+            candidates = post_end - post_start
+            lookups = []
+            for kw_id in others:
+                low, high = self._post_starts[kw_id], self._post_starts[kw_id + 1]
+                if high - low <= 4 * candidates:
+                    lookups.append(dict(zip(post_seqs[low:high], post_first[low:high])).get)
+                else:
+                    lookups.append(functools.partial(self._search_posting, low, high))
+            for rank in range(post_start, post_end):
+                seq_id = post_seqs[rank]
+                # Find the position after the last context keyword
+                last_context_pos = post_first[rank]
+                for lookup in lookups:
+                    position = lookup(seq_id)
+                    if position is None:
+                        break
+                    if position > last_context_pos:
+                        last_context_pos = position
+                else:
+                    next_pos = seq_starts[seq_id] + last_context_pos + 1
+                    if next_pos < seq_starts[seq_id + 1]:
+                        next_keyword_counts[seq_values[next_pos]] += 1
+        
+        if not next_keyword_counts:
+            return []
         
         recommendations = []
         total_count = sum(next_keyword_counts.values())
         
-        for keyword, count in next_keyword_counts.most_common(max_recommendations):
+        for kw_id, count in next_keyword_counts.most_common(max_recommendations):
+            keyword = self._id_kw[kw_id]
             confidence = count / total_count
             library = self.keyword_libraries.get(keyword, 'BuiltIn')
             
@@ -191,39 +1067,239 @@ class KeywordPatternAnalyzer:
                 confidence=confidence,
                 context=" -> ".join(context_keywords),
                 usage_count=count,
-                next_keywords=[]
+                next_keywords=()
             )
             recommendations.append(recommendation)
         
         return recommendations
     
+    def _search_posting(self, low: int, high: int, seq_id: int) -> Optional[int]:
+        """Return the first position stored for seq_id in the posting range low:high, if any."""
+        found = bisect_left(self._post_seqs, seq_id, low, high)
+        if found < high and self._post_seqs[found] == seq_id:
+            return self._post_first[found]
+        return None
+    
     def save_model(self, filepath: str):
         """Save the trained model to a file."""
-        model_data = {
-            'keyword_transitions': dict(self.keyword_transitions),
-            'keyword_contexts': {k: list(v) for k, v in self.keyword_contexts.items()},
-            'library_keywords': {k: list(v) for k, v in self.library_keywords.items()},
-            'keyword_frequencies': dict(self.keyword_frequencies),
-            'keyword_libraries': self.keyword_libraries,
-            'keyword_sequences': self.keyword_sequences
+        self._release_shared()
+        with open(filepath, 'wb') as f:
+            pickle.dump(self._model_columns(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def _model_columns(self) -> Dict:
+        """Return the model as the dictionary of columns written by save_model."""
+        if not self._finalized:
+            self.finalize()
+        
+        # Per-keyword columns are indexed by keyword id
+        library_names = list(self._library_ids)
+        library_id = {library: i for i, library in enumerate(library_names)}
+        keyword_library = array('i', (library_id[self.keyword_libraries[keyword]]
+                                      for keyword in self._id_kw))
+        library_starts = array('i', [0])
+        library_members = array('i')
+        for kw_ids in self._library_ids.values():
+            library_members.extend(kw_ids)
+            library_starts.append(len(library_members))
+        
+        return {
+            'format_version': self.MODEL_FORMAT_VERSION,
+            'keywords': self._id_kw,
+            'libraries': library_names,
+            'keyword_library': keyword_library,
+            'keyword_frequency': self._kw_freq,
+            'library_starts': library_starts,
+            'library_members': library_members,
+            'transition_starts': self._trans_starts,
+            'transition_next': self._trans_next,
+            'transition_counts': self._trans_counts,
+            'top_starts': self._top_starts,
+            'top_next': self._top_next,
+            'top_counts': self._top_counts,
+            'transition_totals': self._trans_totals,
+            'contexts': self._ctx_strings,
+            'context_starts': self._ctx_starts,
+            'context_values': self._ctx_values,
+            'sequence_values': self._seq_values,
+            'sequence_starts': self._seq_starts,
+            'posting_starts': self._post_starts,
+            'posting_sequences': self._post_seqs,
+            'posting_first': self._post_first,
+            'suffix_ids': self._suffix_ids,
+            'suffix_offsets': self._suffix_offsets
         }
+    
+    def export_shared(self, meta_path: str) -> List:
+        """
+        Save the model for attach_shared(), placing its large columns in shared memory.
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
+        Args:
+            meta_path: File receiving the rest of the model and the names of the blocks
+            
+        Returns:
+            The created SharedMemory blocks; the caller keeps them open while other
+            processes use the model, then closes and unlinks them
+        """
+        if shared_memory is None:
+            raise RuntimeError("Shared memory models require Python 3.8 or newer")
+        model_data = self._model_columns()
+        blocks = []
+        try:
+            for column in self.SHARED_COLUMNS:
+                with memoryview(model_data[column]) as values:
+                    # Blocks cannot be empty
+                    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                    blocks.append(block)
+                    block.buf[:values.nbytes] = values.cast('B')
+                    model_data[column] = (block.name, values.format, len(values))
+            with open(meta_path, 'wb') as f:
+                pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+        return blocks
+    
+    def attach_shared(self, meta_path: str):
+        """
+        Load a model saved by export_shared() without copying its shared columns.
+        
+        The columns are read in place from the shared memory blocks, so every
+        process attached to the same export uses one copy of them. Training or
+        saving the model afterwards copies them back into private arrays first.
+        
+        Args:
+            meta_path: File written by export_shared()
+        """
+        if shared_memory is None:
+            raise RuntimeError("Shared memory models require Python 3.8 or newer")
+        with open(meta_path, 'rb') as f:
+            model_data = pickle.load(f)
+        
+        self._release_shared()
+        for column in self.SHARED_COLUMNS:
+            name, typecode, length = model_data[column]
+            block = shared_memory.SharedMemory(name=name)
+            self._shared_blocks.append(block)
+            model_data[column] = block.buf[:length * array(typecode).itemsize].cast(typecode)
+        self._load_columns(model_data)
+        self.finalize()
+        _ATTACHED_ANALYZERS.add(self)
+    
+    def _release_shared(self, keep_columns: bool = True):
+        """
+        Close the shared memory blocks opened by attach_shared(), if any.
+        
+        Args:
+            keep_columns: Copy the shared columns into private arrays first, so the
+                          model stays usable
+        """
+        if not self._shared_blocks:
+            return
+        for attribute in self.SHARED_COLUMNS.values():
+            values = getattr(self, attribute)
+            if isinstance(values, memoryview):
+                if keep_columns:
+                    setattr(self, attribute, array(values.format, values))
+                values.release()
+        for block in self._shared_blocks:
+            block.close()
+        self._shared_blocks = []
+        _ATTACHED_ANALYZERS.discard(self)
+        # The autocomplete index referenced the released views
+        self._finalized = False
     
     def load_model(self, filepath: str):
         """Load a trained model from a file."""
         with open(filepath, 'rb') as f:
             model_data = pickle.load(f)
         
-        self.keyword_transitions = defaultdict(Counter, model_data['keyword_transitions'])
-        self.keyword_contexts = defaultdict(set, 
-            {k: set(v) for k, v in model_data['keyword_contexts'].items()})
-        self.library_keywords = defaultdict(set, 
-            {k: set(v) for k, v in model_data['library_keywords'].items()})
-        self.keyword_frequencies = Counter(model_data['keyword_frequencies'])
+        self._release_shared()
+        if model_data.get('format_version') in (2, self.MODEL_FORMAT_VERSION):
+            self._load_columns(model_data)
+        else:
+            self._load_legacy(model_data)
+        self.finalize()
+    
+    def _load_columns(self, model_data: Dict):
+        """Restore the model from the columns written by save_model."""
+        id_kw = self._id_kw = model_data['keywords']
+        self._kw_id = {keyword: kw_id for kw_id, keyword in enumerate(id_kw)}
+        
+        library_names = model_data['libraries']
+        self.keyword_libraries = dict(zip(id_kw, (library_names[library_id] for library_id
+                                                  in model_data['keyword_library'])))
+        self._kw_freq = array('i', model_data['keyword_frequency'])
+        
+        library_starts = model_data['library_starts']
+        library_members = model_data['library_members']
+        # Format version 2 stored the members in set order
+        self._library_ids = {
+            library: array('i', sorted(library_members[library_starts[i]:library_starts[i + 1]]))
+            for i, library in enumerate(library_names)}
+        self._library_sets = None
+        
+        self._trans_starts = model_data['transition_starts']
+        self._trans_next = model_data['transition_next']
+        self._trans_counts = model_data['transition_counts']
+        self._trans_dicts = None
+        
+        self._top_starts = model_data['top_starts']
+        self._top_next = model_data['top_next']
+        self._top_counts = model_data['top_counts']
+        self._trans_totals = model_data['transition_totals']
+        
+        if 'keyword_contexts' in model_data:
+            # Format version 2 stored contexts as lists of names
+            self._set_contexts(model_data['keyword_contexts'])
+        else:
+            self._ctx_strings = model_data['contexts']
+            self._ctx_id = {context: ctx_id for ctx_id, context in enumerate(self._ctx_strings)}
+            self._ctx_starts = model_data['context_starts']
+            self._ctx_values = model_data['context_values']
+            self._ctx_sets = None
+        self._seq_values = model_data['sequence_values']
+        self._seq_starts = model_data['sequence_starts']
+        self._post_starts = model_data['posting_starts']
+        self._post_seqs = model_data['posting_sequences']
+        self._post_first = model_data['posting_first']
+        # Models saved before the suffix columns were added sort the suffixes again
+        self._suffix_ids = model_data.get('suffix_ids')
+        self._suffix_offsets = model_data.get('suffix_offsets')
+    
+    def _load_legacy(self, model_data: Dict):
+        """Restore a model saved as dictionaries of names; indexes are rebuilt by finalize()."""
         self.keyword_libraries = model_data['keyword_libraries']
-        self.keyword_sequences = model_data['keyword_sequences']
+        self._suffix_ids = None
+        
+        # Keyword ids follow the order of keyword_libraries, as they do after training
+        self._kw_id = {}
+        self._id_kw = []
+        self._kw_freq = array('i')
+        for keyword in self.keyword_libraries:
+            self._intern(keyword)
+        frequencies = model_data['keyword_frequencies']
+        self._kw_freq = array('i', (frequencies.get(keyword, 0) for keyword in self._id_kw))
+        self._trans_dicts = {
+            self._kw_id[keyword]: {self._kw_id[next_keyword]: count
+                                   for next_keyword, count in transitions.items()}
+            for keyword, transitions in model_data['keyword_transitions'].items()}
+        self._library_sets = {library: {self._kw_id[keyword] for keyword in keywords}
+                              for library, keywords in model_data['library_keywords'].items()}
+        self._set_contexts(model_data['keyword_contexts'])
+        self._seq_values = array('i')
+        self._seq_starts = array('i', [0])
+        if 'sequence_values' in model_data:
+            id_kw = model_data['keyword_ids']
+            sequence_values = [self._intern(id_kw[kw_id]) for kw_id in model_data['sequence_values']]
+            self._seq_values = array('i', sequence_values)
+            self._seq_starts = model_data['sequence_starts']
+        else:
+            for sequence in model_data['keyword_sequences']:
+                self._add_sequence([self._intern(keyword) for keyword in sequence])
+        self._top_starts = None
+        self._post_starts = None
 
 
 class RobotKeywordRecommender:
@@ -238,19 +1314,34 @@ class RobotKeywordRecommender:
         """Train the recommendation system on multiple output files."""
         print(f"Training on {len(output_files)} output files...")
         
-        for i, output_file in enumerate(output_files, 1):
-            print(f"Processing file {i}/{len(output_files)}: {output_file}")
-            try:
-                self.analyzer.analyze_output_file(output_file)
-            except Exception as e:
-                print(f"Error processing {output_file}: {e}")
+        # Files are parsed in worker processes and merged in the given order,
+        # so the model is the same as when analyzing them one by one
+        workers = min(len(output_files), os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_extract_partial, output_file)
+                           for output_file in output_files]
+                self._merge_partials(output_files, (future.result for future in futures))
+        else:
+            self._merge_partials(output_files, (functools.partial(_extract_partial, output_file)
+                                                for output_file in output_files))
         
-        print(f"Training complete. Analyzed {len(self.analyzer.keyword_sequences)} sequences.")
+        self.analyzer.finalize()
+        print(f"Training complete. Analyzed {self.analyzer.sequence_count} sequences.")
         
         if save_model:
             self.analyzer.save_model(save_model)
             print(f"Model saved to {save_model}")
     
+    def _merge_partials(self, output_files: List[str], extractions):
+        """Merge the result of calling each of extractions into the analyzer, in file order."""
+        for i, (output_file, extract) in enumerate(zip(output_files, extractions), 1):
+            print(f"Processing file {i}/{len(output_files)}: {output_file}")
+            try:
+                self.analyzer.merge_partial(extract())
+            except Exception as e:
+                print(f"Error processing {output_file}: {e}")
+    
     def get_recommendations(self, current_keyword: str, context: str = "", 
                           max_recommendations: int = 10) -> List[Dict]:
         """Get keyword recommendations in a user-friendly format."""
@@ -265,7 +1356,7 @@ class RobotKeywordRecommender:
                 'confidence': round(rec.confidence, 3),
                 'context': rec.context,
                 'usage_count': rec.usage_count,
-                'next_keywords': rec.next_keywords
+                'next_keywords': list(rec.next_keywords)
             }
             for rec in recommendations
         ]
@@ -288,7 +1379,7 @@ class RobotKeywordRecommender:
                 'confidence': round(rec.confidence, 3),
                 'context': rec.context,
                 'usage_count': rec.usage_count,
-                'next_keywords': rec.next_keywords
+                'next_keywords': list(rec.next_keywords)
             }
             for rec in recommendations
         ]
@@ -313,19 +1404,7 @@ class RobotKeywordRecommender:
     
     def get_library_statistics(self) -> Dict:
         """Get statistics about keyword libraries."""
-        stats = {}
-        for library, keywords in self.analyzer.library_keywords.items():
-            total_usage = sum(self.analyzer.keyword_frequencies[kw] for kw in keywords)
-            stats[library] = {
-                'keyword_count': len(keywords),
-                'total_usage': total_usage,
-                'top_keywords': [
-                    {'keyword': kw, 'count': self.analyzer.keyword_frequencies[kw]}
-                    for kw, _ in Counter({kw: self.analyzer.keyword_frequencies[kw] 
-                                        for kw in keywords}).most_common(5)
-                ]
-            }
-        return stats
+        return self.analyzer.get_library_statistics()
 
 
 def main():
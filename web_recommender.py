@@ -7,39 +7,72 @@ with real-time autocomplete and intelligent suggestions.
 """
 
 from flask import Flask, render_template, request, jsonify
+import functools
 import json
 from robot_keyword_recommender import RobotKeywordRecommender
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 
 # Global recommender instance
 recommender = None
 
+# Model file loaded or trained at startup
+MODEL_FILE = "robot_keyword_model.pkl"
+# Environment variable naming a model exported to shared memory (see gunicorn.conf.py)
+SHARED_MODEL_ENV = "ROBOT_KEYWORD_SHARED_MODEL"
+
+def find_output_files() -> list:
+    """Find the output.xml files in the current directory to train on."""
+    return [file for file in os.listdir('.') if file.endswith('output.xml')]
+
 def initialize_recommender():
     """Initialize the recommender with existing model or train on available data."""
     global recommender
     
-    model_file = "robot_keyword_model.pkl"
+    model_file = MODEL_FILE
+    shared_model = os.environ.get(SHARED_MODEL_ENV)
     
-    if os.path.exists(model_file):
+    if shared_model:
+        print("Attaching to shared model...")
+        recommender = RobotKeywordRecommender()
+        recommender.analyzer.attach_shared(shared_model)
+    elif os.path.exists(model_file):
         print("Loading existing model...")
         recommender = RobotKeywordRecommender(model_file)
     else:
         print("No existing model found. Training on available data...")
         recommender = RobotKeywordRecommender()
         
-        # Look for output.xml files in current directory
-        output_files = []
-        for file in os.listdir('.'):
-            if file.endswith('output.xml'):
-                output_files.append(file)
-        
+        output_files = find_output_files()
         if output_files:
             recommender.train_on_output_files(output_files, model_file)
         else:
             print("No output.xml files found. Please train the model first.")
             recommender = RobotKeywordRecommender()
+    
+    popular_keywords_body.cache_clear()
+
+def encode_json(payload) -> bytes:
+    """Encode a response payload, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return app.json.dumps(payload).encode()
+
+def json_response(payload):
+    """Build a JSON response from a payload or from already encoded bytes."""
+    body = payload if isinstance(payload, bytes) else encode_json(payload)
+    return app.response_class(body, mimetype='application/json')
+
+@functools.lru_cache(maxsize=256)
+def popular_keywords_body(library, limit: int) -> bytes:
+    """Encoded /api/popular response, cached until the recommender is reinitialized."""
+    return encode_json({'keywords': recommender.get_popular_keywords(library, limit)})
 
 @app.route('/')
 def index():
@@ -61,7 +94,7 @@ def get_recommendations():
         recommendations = recommender.get_recommendations(
             current_keyword, context, max_recommendations
         )
-        return jsonify({'recommendations': recommendations})
+        return json_response({'recommendations': recommendations})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -77,7 +110,7 @@ def get_autocomplete():
     
     try:
         suggestions = recommender.get_autocomplete(partial_keyword, library_filter)
-        return jsonify({'suggestions': suggestions})
+        return json_response({'suggestions': suggestions})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -95,7 +128,7 @@ def get_context_recommendations():
         recommendations = recommender.get_context_recommendations(
             context_keywords, max_recommendations
         )
-        return jsonify({'recommendations': recommendations})
+        return json_response({'recommendations': recommendations})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -109,8 +142,7 @@ def get_popular_keywords():
     limit = int(request.args.get('limit', 20))
     
     try:
-        popular = recommender.get_popular_keywords(library, limit)
-        return jsonify({'keywords': popular})
+        return json_response(popular_keywords_body(library, limit))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -124,7 +156,7 @@ def get_libraries():
         stats = recommender.get_library_statistics()
         libraries = [{'name': lib, 'keyword_count': data['keyword_count']} 
                     for lib, data in stats.items()]
-        return jsonify({'libraries': libraries})
+        return json_response({'libraries': libraries})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -136,7 +168,7 @@ def get_statistics():
     
     try:
         stats = recommender.get_library_statistics()
-        return jsonify({'statistics': stats})
+        return json_response({'statistics': stats})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 